@@ -1,11 +1,33 @@
+from .aioclient import AsyncClient
 from .attribute import FetchedResponses as FetchedResponsesAttr
 from .attribute import Student as StudentAttr
 from .attribute import Token as TokenAttr
 from .attribute import User as UserAttr
 from .attribute import Schedule as ScheduleAttr
+from .breaker import Bulkhead, CircuitBreaker
+from .cache import CachedResponse, PrefixCache, ResponseCache, SQLiteCache
+from .catalog import SubjectCatalog
 from .constant import APP_KEY
-from .exception import TokenExpired
+from .crawler import CatalogSink, Crawler, JSONLSink, SQLiteSink
+from .deadline import Deadline
+from .exception import BulkheadFull, CircuitOpen, DeadlineExceeded, TokenExpired
+from .hedge import HedgePolicy
 from .pymyku import Client
-from .type import ClientType, Response
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .session import Session
+from .workqueue import WorkQueue, Worker
+from .type import (
+    BulkResult,
+    ClientType,
+    CrawlResult,
+    EnrollmentHistory,
+    FetchAllResult,
+    Response,
+    SemesterEnrollment,
+    SubjectMatch,
+    SweepResult,
+    Task,
+)
 
 __version__ = "0.3.1"
@@ -0,0 +1,19 @@
+import sqlite3
+
+
+class Transaction(object):
+    """Write transaction that takes the database write lock up front.
+
+    Used by the SQLite backed :class:`pymyku.cache.SQLiteCache`, :class:`pymyku.workqueue.WorkQueue`
+    and :class:`pymyku.ratelimit.RateLimiter`, whose connections are opened with ``isolation_level=None``.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, *args) -> None:
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
@@ -0,0 +1,845 @@
+import asyncio
+
+from . import aiorequests, attribute, exception, utils
+from .aiorequests import aiohttp
+from .type import Any, ClientType, Dict, Enum, List, Optional, Union
+
+
+class AsyncClient(ClientType):
+    """Asynchronous counterpart of :class:`pymyku.Client` built on :mod:`asyncio` and aiohttp.
+
+    Every method that sends a request is a coroutine. The client does not login on creation,
+    await :meth:`initialize` or use the client as an asynchronous context manager.
+    All requests of the client share one aiohttp connection pool.
+
+    Requires the optional dependency aiohttp (``pip install pymyku[async]``).
+
+    Parameters
+    ----------
+    username : str
+        Your Nontri account username (b##########)
+    password : str
+        Your password (Don't worry, your password is not saved)
+    session : Optional[aiohttp.ClientSession]
+        Session to send the requests with. If not provided, the client creates and owns one.
+    limit : int
+        Maximum number of simultaneous connections of the owned session, by default 100
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        session: Optional["aiohttp.ClientSession"] = None,
+        limit: int = 100,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for AsyncClient, install it with 'pip install pymyku[async]'"
+            )
+
+        self.__username: str = username
+        self.__password: str = password
+        self.__owns_session: bool = session is None
+        self.__session: Optional["aiohttp.ClientSession"] = session
+        self.__limit: int = limit
+        self.__login_response: dict = {}
+        self.__access_token: str = ""
+        self.__schedule_response: dict = {}
+        self.__academic_year: Optional[str] = None
+        self.__semester: Optional[str] = None
+        # Created on first use, inside the running event loop.
+        self.__refresh_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        try:
+            await self.initialize()
+        except BaseException:
+            # __aexit__ does not run when __aenter__ raises.
+            await self.close()
+            raise
+
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    @property
+    def session(self) -> Optional["aiohttp.ClientSession"]:
+        """Session used to send the requests of the client.
+
+        Returns
+        -------
+        Optional[aiohttp.ClientSession]
+            Session of the client, None before :meth:`initialize` when the client owns it.
+        """
+        return self.__session
+
+    @property
+    def login_response(self) -> dict:
+        """Recent login response.
+
+        Returns
+        -------
+        dict
+            Response from the login request. Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+        """
+        return self.__login_response
+
+    @property
+    def access_token(self) -> str:
+        """Recent access token from the login response.
+
+        Returns
+        -------
+        str
+            Access token. Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+        """
+        return self.__access_token
+
+    @property
+    def schedule_response(self) -> dict:
+        """Recent schedule response.
+
+        Returns
+        -------
+        dict
+            Response from the schedule request. Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
+        """
+        return self.__schedule_response
+
+    @property
+    def academic_year(self) -> Optional[str]:
+        """Current academic year.
+
+        Returns
+        -------
+        Optional[str]
+            Current academic year. Represented by :class:`pymyku.attribute.Schedule.ACADEMIC_YEAR`
+        """
+        return self.__academic_year
+
+    @property
+    def semester(self) -> Optional[str]:
+        """Current semester.
+
+        Returns
+        -------
+        Optional[str]
+            Current semester. Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+        """
+        return self.__semester
+
+    @property
+    def user_data(self) -> dict:
+        """Return the user data extracted form login response.
+
+        Returns
+        -------
+        dict
+            User data. Represented by :class:`pymyku.attribute.User`
+        """
+        return self.login_response.get("user", {})
+
+    @property
+    def student_data(self) -> dict:
+        """Return the student data extracted form login response.
+
+        Returns
+        -------
+        dict
+            Student data. Represented by :class:`pymyku.attribute.Student`
+        """
+        return self.user_data.get("student", {})
+
+    @property
+    def std_code(self) -> Optional[str]:
+        """Return the student code extracted from the login response.
+
+        Returns
+        -------
+        str
+            Student code. Represented by :class:`pymyku.attribute.Student.STD_CODE`
+        """
+        return self.student_data.get("stdCode")
+
+    async def valid_response(
+        self, response: "aiohttp.ClientResponse", to_json: bool = True
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """If the response is not 200, check if the error is due to an expired token.
+        If so, raise :exc:`exception.TokenExpired`. Otherwise, raise the error
+
+        Requests sent by the client already refresh an expired token and retry once,
+        so :exc:`exception.TokenExpired` is only raised when that retry expired as well.
+        The client is left as is for the other coroutines sharing it, the next request refreshes the token again.
+
+        Parameters
+        ----------
+        response : aiohttp.ClientResponse
+            The response object returned from the request.
+        to_json : Optional[dict]
+            If True, the response will be converted to a JSON object.
+
+        Returns
+        -------
+        Union[dict, aiohttp.ClientResponse]
+            Return the response if the response is 200. Otherwise, raise the error.
+
+        Raises
+        ------
+        exception.TokenExpired
+            If the response is due to an expired token.
+        aiohttp.ClientResponseError
+            If the response is not 200.
+        """
+
+        data = await response.json(content_type=None)
+
+        if response.status != 200:
+
+            if isinstance(data, dict) and data.get("code") == "expired":
+                raise exception.TokenExpired("The access token has expired.")
+
+        response.raise_for_status()
+
+        return data if to_json else response
+
+    async def initialize(self) -> None:
+        """Initialize the client by logging in and fetch user data.
+        :meth:`login` will be called to fetch login data.
+        After that, :meth:`fetch_schedule` will be called to fetch schedule data.
+
+        Affected attributes: :attr:`login_response`, :attr:`.access_token`, :attr:`.schedule_response`, :attr:`.academic_year` and :attr:`.semester`
+        """
+
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.__limit)
+            )
+
+        await self.login()
+
+        self.__schedule_response = await self.fetch_schedule()
+
+        self.__academic_year, self.__semester = utils.extract_schedule(
+            self.__schedule_response
+        )
+
+    def reset(self) -> None:
+        """Reset the client attributes.
+
+        Affected attributes: :attr:`login_response`, :attr:`.access_token`, :attr:`.schedule_response`, :attr:`.academic_year` and :attr:`.semester`
+        """
+        self.__login_response = {}
+        self.__access_token = ""
+        self.__schedule_response = {}
+        self.__academic_year = None
+        self.__semester = None
+
+    async def close(self) -> None:
+        """Close the session if the session is owned by the client.
+
+        A session passed to the client is left open for its owner to close.
+        """
+        if self.__owns_session and self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def headers(self) -> dict:
+        """Return the headers for the requests.
+
+        Returns
+        -------
+        dict
+            The headers for the requests containing :attr:`pymyku.constant.APP_KEY` and :attr:`access_token`.
+        """
+        return utils.gen_request_headers(self.__access_token)
+
+    async def login(self) -> "aiohttp.ClientResponse":
+        """Login to MyKu and fetch user data.
+
+        API: https://myapi.ku.th/auth/login
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            Response object from the login request. Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+        """
+
+        login_response = await aiorequests.login(
+            self.__username, self.__password, session=self.__session
+        )
+
+        login_response.raise_for_status()
+
+        self.__login_response = await login_response.json(content_type=None)
+        self.__access_token = self.__login_response["accesstoken"]
+
+        return login_response
+
+    async def renew(self) -> "aiohttp.ClientResponse":
+        """Get a new access token with the renew token instead of logging in again.
+
+        API: https://myapi.ku.th/auth/renew
+
+        Affected attributes: :attr:`login_response` and :attr:`.access_token`
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            Response object from the renew request.
+
+        Raises
+        ------
+        ValueError
+            The login response has no renew token.
+        aiohttp.ClientResponseError
+            The request is not successful.
+        """
+
+        renew_response = await aiorequests.renew(client=self)
+
+        renew_response.raise_for_status()
+
+        data = await renew_response.json(content_type=None)
+        access_token = utils.extract_access_token(data)
+
+        login_response = dict(self.__login_response)
+        login_response["accesstoken"] = access_token
+        login_response["renewtoken"] = data.get(
+            "renewtoken", login_response.get("renewtoken")
+        )
+
+        self.__login_response = login_response
+        self.__access_token = access_token
+
+        return renew_response
+
+    async def refresh(self, expired_token: Optional[str] = None) -> None:
+        """Replace an expired access token.
+
+        :meth:`renew` is tried first, :meth:`login` is called only if the renewal fails.
+        Only one coroutine refreshes at a time, the others wait for it to finish.
+
+        Affected attributes: :attr:`login_response` and :attr:`.access_token`
+
+        Parameters
+        ----------
+        expired_token : Optional[str]
+            The access token found expired. If another coroutine has already replaced it
+            while waiting, nothing is refreshed. By default the current token is refreshed.
+        """
+
+        if self.__refresh_lock is None:
+            self.__refresh_lock = asyncio.Lock()
+
+        async with self.__refresh_lock:
+            if expired_token is not None and expired_token != self.__access_token:
+                return
+
+            try:
+                await self.renew()
+            except (ValueError, KeyError, aiohttp.ClientError):
+                await self.login()
+
+    async def __fetch(
+        self, function: callable, as_response: Optional[bool] = False, **kwargs
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """Send the request of an :mod:`pymyku.aiorequests` function on behalf of the client.
+
+        If the access token has expired, it is refreshed with :meth:`refresh`
+        and the request is sent once more.
+        """
+
+        access_token = self.__access_token
+
+        response = await function(client=self, **kwargs)
+
+        if response.status != 200:
+            data = await response.json(content_type=None)
+
+            if isinstance(data, dict) and data.get("code") == "expired":
+                await self.refresh(access_token)
+                response = await function(client=self, **kwargs)
+
+        if as_response:
+            return response
+
+        return await response.json(content_type=None)
+
+    async def fetch_schedule(
+        self, as_response: Optional[bool] = False
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """Send GET request to MyKU common/getschedule API.
+
+        API: https://myapi.ku.th/common/getschedule
+
+        Parameters
+        ----------
+        as_response : Optional[bool]
+            Return as Response object if True, otherwise dict, by default False
+
+        Returns
+        -------
+        Union[dict, aiohttp.ClientResponse]
+            Response from the request. Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
+        """
+
+        return await self.__fetch(aiorequests.get_schedule, as_response)
+
+    async def fetch_announce(
+        self, academic_year=None, semester=None, as_response: Optional[bool] = False
+    ) -> Union[List[dict], "aiohttp.ClientResponse"]:
+        """Send GET request to MyKU advisor/getAnnounceStd API.
+
+        API: https://myapi.ku.th/advisor/getAnnounceStd
+
+        Parameters
+        ----------
+        as_response : Optional[bool]
+            Return as Response object if True, otherwise dict, by default False
+
+        Returns
+        -------
+            Union[List[dict], aiohttp.ClientResponse]
+
+        """
+
+        return await self.__fetch(
+            aiorequests.get_announce,
+            as_response,
+            academic_year=academic_year,
+            semester=semester,
+        )
+
+    async def fetch_grades(
+        self, as_response: Optional[bool] = False
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """Send GET request to MyKU std-profile/checkGrades API.
+
+        API: https://myapi.ku.th/std-profile/checkGrades
+
+        Parameters
+        ----------
+        as_response : Optional[bool]
+            Return as Response object if True, otherwise dict, by default False
+
+        Returns
+        -------
+        Union[dict, aiohttp.ClientResponse]
+            Response from the request.
+        """
+
+        return await self.__fetch(aiorequests.get_check_grades, as_response)
+
+    async def fetch_group_course(
+        self, as_response: Optional[bool] = False
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """Send GET request to MyKU std-profile/getGroupCourse API.
+
+        API: https://myapi.ku.th/std-profile/getGroupCourse
+
+        Parameters
+        ----------
+        as_response : Optional[bool]
+            Return as Response object if True, otherwise dict, by default False
+
+        Returns
+        -------
+        Union[dict, aiohttp.ClientResponse]
+            Response from the request.
+        """
+
+        return await self.__fetch(aiorequests.get_group_course, as_response)
+
+    async def fetch_student_address(
+        self, as_response: Optional[bool] = False
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """Send GET request to MyKU std-profile/getStdAddress API.
+
+        API: https://myapi.ku.th/std-profile/getStdAddress
+
+        Parameters
+        ----------
+        as_response : Optional[bool]
+            Return as Response object if True, otherwise dict, by default False
+
+        Returns
+        -------
+        Union[dict, aiohttp.ClientResponse]
+            Response from the request.
+        """
+
+        return await self.__fetch(aiorequests.get_student_address, as_response)
+
+    async def fetch_student_personal(
+        self, as_response: Optional[bool] = False
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """Send GET request to MyKU std-profile/getStdPersonal API.
+
+        API: https://myapi.ku.th/std-profile/getStdPersonal
+
+        Parameters
+        ----------
+        as_response : Optional[bool]
+            Return as Response object if True, otherwise dict, by default False
+
+        Returns
+        -------
+        Union[dict, aiohttp.ClientResponse]
+            Response from the request.
+        """
+
+        return await self.__fetch(aiorequests.get_student_personal, as_response)
+
+    async def fetch_student_education(
+        self, as_response: Optional[bool] = False
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """Send GET request to MyKU std-profile/getStdEducation API.
+
+        API: https://myapi.ku.th/std-profile/getStdEducation
+
+        Parameters
+        ----------
+        as_response : Optional[bool]
+            Return as Response object if True, otherwise dict, by default False
+
+        Returns
+        -------
+        Union[dict, aiohttp.ClientResponse]
+            Response from the request.
+        """
+
+        return await self.__fetch(aiorequests.get_student_education, as_response)
+
+    async def fetch_gpax(
+        self, as_response: Optional[bool] = False
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """Send GET request to MyKU stddashboard/gpax API.
+
+        API: https://myapi.ku.th/stddashboard/gpax
+
+        Parameters
+        ----------
+        as_response : Optional[bool]
+            Return as Response object if True, otherwise dict, by default False
+
+        Returns
+        -------
+        Union[dict, aiohttp.ClientResponse]
+            Response from the request.
+        """
+
+        return await self.__fetch(aiorequests.get_gpax, as_response)
+
+    async def fetch_enroll(
+        self,
+        academic_year: Optional[Union[str, int]] = None,
+        semester: Optional[Union[str, int]] = None,
+        as_response: Optional[bool] = False,
+    ) -> Union[dict, "aiohttp.ClientResponse"]:
+        """Send GET request to MyKU enroll/searchEnrollResult API.
+
+        API: https://myapi.ku.th/enroll/searchEnrollResult
+
+        Parameters
+        ----------
+        academic_year : Optional[Union[str, int]], optional
+            Academic year, if not provided, will use the current academic year.
+            Represented by :class:`pymyku.attribute.Schedule.ACADEMIC_YEAR`
+        semester : Optional[Union[str, int]], optional
+            Semester, if not provided, will use the current semester.
+            Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+        as_response : Optional[bool]
+            Return as Response object if True, otherwise dict, by default False
+
+        Returns
+        -------
+        Union[dict, aiohttp.ClientResponse]
+            Response from the request.
+        """
+
+        if isinstance(semester, int):
+            semester = str(semester)
+
+        if isinstance(academic_year, int):
+            academic_year = str(academic_year)
+
+        return await self.__fetch(
+            aiorequests.search_enroll,
+            as_response,
+            academic_year=academic_year,
+            semester=semester,
+        )
+
+    async def search_subject(self, query: str) -> List[Dict[str, str]]:
+        """Query subject with subject id by sending GET request to MyKU enroll/searchSubjectOpenEnr API.
+
+        API: https://myapi.ku.th/enroll/searchSubjectOpenEnr
+
+        Parameters
+        ----------
+        query : str
+            Subject id or name to query. (At least 3 characters), e.g. '013', '01355119', 'eng' or 'english'
+
+        Returns
+        -------
+        List[Dict[str, str]]
+            List of subject dicts.
+
+        Raises
+        ------
+        ValueError
+            The query is less than 3 characters long.
+
+        aiohttp.ClientResponseError
+            The request is not successful.
+        """
+
+        if len(query) < 3:
+            raise ValueError("Subject ID must be at least 3 characters long.")
+
+        response = await self.__fetch(aiorequests.search_subject, True, query=query)
+
+        response = await self.valid_response(response)
+
+        return response.get("subjects", [])
+
+    async def search_subject_open(
+        self,
+        subject_id: str,
+        section: Optional[str] = "",
+        campus_code: Optional[str] = "",
+    ) -> List[Dict[str, Union[str, int]]]:
+        """Query subject enrollment info (All section) of current semester by sending GET request to MyKU enroll/openSubjectForEnroll API.
+
+        API: https://myapi.ku.th/enroll/openSubjectForEnroll
+
+        Parameters
+        ----------
+        subject_id : str
+            Subject id to query, e.g. '01355119' or '01355119-64'
+        section : Optional[str]
+            Section of the subject, e.g. '1'
+        campus_code : Optional[str]
+            Campus code, 'B' for Bang Khen, 'C' for Sakolkorn, 'I' for affiliated institute,
+            'K' for Kamphaeng Saen, 'P' for Suphanburi.
+
+        Returns
+        -------
+        List[Dict[str, Union[str, int]]]
+            List of subject's opening section.
+
+        Raises
+        ------
+        aiohttp.ClientResponseError
+            The request is not successful.
+        """
+
+        response = await self.__fetch(
+            aiorequests.search_subject_open,
+            True,
+            query=subject_id,
+            section=section,
+            campus_code=campus_code,
+        )
+
+        response = await self.valid_response(response)
+
+        return response.get("results", [])
+
+    async def search_section_detail(
+        self, subject_id: str
+    ) -> Dict[str, Union[Dict[str, List[Union[str, int]]], list, str]]:
+        """Send GET request to MyKU enroll/searchSectionDetail API.
+
+        API: https://myapi.ku.th/enroll/searchSectionDetail
+
+        Parameters
+        ----------
+        section_id : str
+            Section id. e.g. '186426'
+
+        Returns
+        -------
+        Dict[str, Union[str, int]]
+            Detail of the section.
+        """
+
+        response = await self.__fetch(
+            aiorequests.search_section_detail, True, section_id=subject_id
+        )
+
+        response = await self.valid_response(response)
+
+        return response.get("sectionDetail", {})
+
+    def get(self, attr: Enum) -> Any:
+        """Get any value from MyKU client. (login response and schedule response)
+        Use enums from pymyku.attribute as key to get value.
+
+        Parameters
+        ----------
+        attr : Enum
+            Enum from attribute.
+
+        Returns
+        -------
+        Any
+            Value of the attribute.
+
+        Raises
+        -------
+        TypeError
+            The attr is not an Enum.
+        """
+
+        if isinstance(attr, attribute.FetchedResponses):
+            if attr.value == 0:
+                return self.__login_response
+            elif attr.value == 1:
+                return self.__schedule_response
+
+        if isinstance(attr, attribute.Schedule):
+            return utils.extract(self.__schedule_response, attr)
+
+        return utils.extract(self.__login_response, attr)
+
+    async def get_group_course(self) -> List[dict]:
+        """Send GET request to MyKU std-profile/getGroupCourse API and return the result.
+
+        Returns
+        -------
+        List[dict]
+            List of group course dicts (timetable).
+
+        Raises
+        -------
+        exception.TokenExpired
+            The token is expired.
+        aiohttp.ClientResponseError
+            The request is not successful.
+        """
+
+        response = await self.fetch_group_course(as_response=True)
+
+        response = await self.valid_response(response)
+
+        return response.get("results", [])
+
+    async def get_gpax(self) -> float:
+        """Send GET request to MyKU std-profile/getGPAX API and return the gpax.
+
+        Returns
+        -------
+        float
+            GPAX.
+
+        Raises
+        -------
+        exception.TokenExpired
+            The token is expired.
+        aiohttp.ClientResponseError
+            The request is not successful.
+        """
+
+        response = await self.fetch_gpax(as_response=True)
+
+        response = await self.valid_response(response)
+
+        return response.get("results", {})[0].get("gpax")
+
+    async def get_total_credit(self) -> int:
+        """Send GET request to MyKU std-profile/getTotalCredit API and return the total credit.
+
+        Returns
+        -------
+        int
+            Total credit.
+
+        Raises
+        ------
+        exception.TokenExpired
+            The token is expired.
+        aiohttp.ClientResponseError
+            The request is not successful.
+        """
+
+        response = await self.fetch_gpax(as_response=True)
+
+        response = await self.valid_response(response)
+
+        return response.get("results", {})[0].get("total_credit", None)
+
+    async def get_grades(
+        self, key: Optional[str] = "subject_code"
+    ) -> Dict[str, Dict[str, str]]:
+        """Fetch grades for each subjects in all semesters.
+
+        Parameters
+        ----------
+        key : str
+            Subject key from the response.
+            Can be `subject_code` or `subject_name_en`.
+            Otherwise, `subject_code` will be used.
+            Defaults to "subject_code".
+
+        Returns
+        -------
+        Dict[str, Dict[str, str]]:
+            Dict of grades for each subjects in all semesters.
+
+        Raises
+        -------
+        exception.TokenExpired
+            The token is expired.
+        aiohttp.ClientResponseError
+            The request is not successful.
+        """
+        grades = {}
+
+        key = key if key in ("subject_code", "subject_name_en") else "subject_code"
+
+        response = await self.fetch_grades(as_response=True)
+
+        response = await self.valid_response(response)
+
+        for semester in response["results"]:
+
+            year = semester["academicYear"]
+            grades[year] = {}
+            grades[year]["gpa"] = semester["gpa"]
+            grades[year]["cr"] = semester["cr"]
+            for subject in semester["grade"]:
+                grades[year][subject[key]] = subject["grade"]
+
+        return grades
+
+    async def get_enrolled_subjects(
+        self,
+        academic_year: Optional[Union[str, int]] = None,
+        semester: Optional[Union[str, int]] = None,
+    ) -> List[dict]:
+        """Get enrolled subjects in a specific semester.
+
+        Parameters
+        ----------
+        academic_year : Optional[Union[str, int]], optional
+            Academic year, if not provided, will use the current academic year.
+            Represented by :class:`pymyku.attribute.Schedule.ACADEMIC_YEAR`
+        semester : Optional[Union[str, int]], optional
+            Semester, if not provided, will use the current semester.
+            Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+
+        Returns
+        -------
+        List[dict]
+            List of enrolled subjects.
+        """
+        response = await self.fetch_enroll(academic_year, semester, True)
+
+        response = await self.valid_response(response)
+
+        subjects = [subj for subj in response["enrollSubjects"]]
+
+        return subjects
@@ -0,0 +1,760 @@
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from . import utils
+from .type import ClientType, Optional, Response, Union
+
+
+async def _send(
+    method: str,
+    params: dict,
+    session: Optional["aiohttp.ClientSession"] = None,
+    client: Optional[ClientType] = None,
+) -> "aiohttp.ClientResponse":
+    """Send a request with the parameters generated by :meth:`pymyku.utils.gen_request_args_f`.
+
+    The request is sent through `session` if given, otherwise through the session of `client`.
+    Without both, a one-off session is used.
+    The body is read before returning, so the connection goes back to the pool right away.
+    """
+
+    if aiohttp is None:
+        raise ImportError(
+            "aiohttp is required for asynchronous requests, install it with 'pip install pymyku[async]'"
+        )
+
+    if session is None and client is not None:
+        session = getattr(client, "session", None)
+
+    # aiohttp refuses None query values that requests silently drops.
+    if params.get("params"):
+        params = dict(params)
+        params["params"] = {
+            key: value for key, value in params["params"].items() if value is not None
+        }
+
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            response = await session.request(method, **params)
+            await response.read()
+            return response
+
+    response = await session.request(method, **params)
+    await response.read()
+
+    return response
+
+
+async def login(
+    username: str, password: str, session: Optional["aiohttp.ClientSession"] = None
+) -> "aiohttp.ClientResponse":
+    """Send POST request to MyKU auth/login API.
+
+    API: https://myapi.ku.th/auth/login
+
+    Parameters
+    ----------
+    username : str
+        Your Nontri account username (b##########)
+    password : str
+        Your password (Don't worry, your password is not saved)
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from auth/login API, with the body already read.
+    """
+    username = username.strip()
+    password = password.strip()
+
+    loop = asyncio.get_running_loop()
+
+    username = await loop.run_in_executor(None, utils.encrypt, username)
+    password = await loop.run_in_executor(None, utils.encrypt, password)
+
+    return await _send(
+        "POST", utils.gen_login_request_params(username, password), session
+    )
+
+
+async def logout(
+    access_token: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send POST request to MyKU auth/logout API.
+
+    *I am uncertain that this request method will work properly.*
+
+    Assigning only `login_response` or `client` is acceptable.
+
+    API: https://myapi.ku.th/auth/logout
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from auth/logout API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(logout, **locals())
+
+    return await _send("POST", params, session, client)
+
+
+async def renew(
+    renew_token: Optional[str] = "",
+    access_token: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send POST request to MyKU auth/renew API to get a new access token without logging in again.
+
+    *I am uncertain that this request method will work properly.*
+
+    Assigning only `login_response` or `client` is acceptable.
+
+    API: https://myapi.ku.th/auth/renew
+
+    Parameters
+    ----------
+    renew_token : Optional[str]
+        'renewtoken' from login response, Represented by :class:`pymyku.attribute.Token.RENEW_TOKEN`
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from auth/renew API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(renew, **locals())
+
+    return await _send("POST", params, session, client)
+
+
+async def get_schedule(
+    access_token: Optional[str] = "",
+    user_type: Optional[str] = "",
+    campus_code: Optional[str] = "",
+    faculty_code: Optional[str] = "",
+    major_code: Optional[str] = "",
+    student_status_code: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU common/getschedule API.
+
+    Assigning only `login_response` or `client` is acceptable.
+
+    API: https://myapi.ku.th/common/getschedule
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    user_type : Optional[str]
+        'userType' attribute from login response, Represented by :class:`pymyku.attribute.User.USER_TYPE`
+    campus_code : Optional[str]
+        'campusCode' attribute from login response, Represented by :class:`pymyku.attribute.Student.CAMPUS_CODE`, e.g. 'B'
+        , e.g. 'B'
+    faculty_code : Optional[str]
+        'facultyCode' attribute from login response, Represented by :class:`pymyku.attribute.Student.FACULTY_CODE`
+    major_code : Optional[str]
+        'majorCode' attribute from login response, Represented by :class:`pymyku.attribute.Student.MAJOR_CODE`
+    student_status_code : Optional[str]
+        'studentStatusCode' attribute from login response, Represented by :class:`pymyku.attribute.Student.STUDENT_STATUS_CODE`
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from common/getschedule API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+    params = utils.gen_request_args_f(get_schedule, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def get_group_course(
+    access_token: Optional[str] = "",
+    std_id: Optional[str] = "",
+    academic_year: Optional[str] = "",
+    semester: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    schedule_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU std-profile/getGroupCourse API.
+
+    Assigning only (`login_response` and `schedule_response`) or `client` is acceptable.
+
+    API: https://myapi.ku.th/std-profile/getGroupCourse
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    std_id : Optional[str]
+        'stdId' attribute from login response, Represented by :class:`pymyku.attribute.Student.STD_ID`
+        , e.g. '20xxxx'
+    academic_year : Optional[str]
+        'academicYr' attribute from schedule response, Represented by :class:`pymyku.attribute.Schedule.ACADEMIC_YEAR`
+        , e.g. '2565'
+    semester : Optional[str]
+        'semester' attribute from schedule response, Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+        , e.g. '0' for summer, '1' for first semester and '2' for second semester.
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    schedule_response : Optional[Union[Response, dict]]
+        Schedule response from :meth:`get_schedule`,
+        Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from std-profile/getGroupCourse API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(get_group_course, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def get_check_grades(
+    access_token: Optional[str] = "",
+    std_code: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU std-profile/checkGrades API.
+
+    Assigning only `login_response` or `client` is acceptable.
+
+
+    API: https://myapi.ku.th/std-profile/checkGrades
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    std_code : Optional[str]
+        'stdCode' attribute from login response, Represented by :class:`pymyku.attribute.Student.STD_CODE`
+        , e.g. '64xxxxxxxx'
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from std-profile/checkGrades API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(get_check_grades, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def get_gpax(
+    access_token: Optional[str] = "",
+    std_id: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU stddashboard/gpax API.
+
+    Assigning only `login_response` or `client` is acceptable.
+
+    API: https://myapi.ku.th/stddashboard/gpax
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    std_id : Optional[str]
+        'stdId' attribute from login response, Represented by :class:`pymyku.attribute.Student.STD_ID`
+        , e.g. '20xxxx'
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from stddashboard/gpax API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(get_gpax, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def get_announce(
+    access_token: Optional[str] = "",
+    std_id: Optional[str] = "",
+    academic_year: Optional[str] = "",
+    semester: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    schedule_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU advisor/getAnnounceStd API.
+
+    Assigning only (`login_response` and `schedule_response`) or `client` is acceptable.
+
+    API: https://myapi.ku.th/advisor/getAnnounceStd
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    std_id : Optional[str]
+        'stdId' attribute from login response, Represented by :class:`pymyku.attribute.Student.STD_ID`
+        , e.g. '20xxxx'
+    academic_year : Optional[str]
+        'academicYr' attribute from schedule response, Represented by :class:`pymyku.attribute.Schedule.ACADEMIC_YEAR`
+        , e.g. '2565'
+    semester : Optional[str]
+        'semester' attribute from schedule response, Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+        , e.g. '0' for summer, '1' for first semester and '2' for second semester.
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    schedule_response : Optional[Union[Response, dict]]
+        Schedule response from :meth:`get_schedule`,
+        Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from advisor/getAnnounceStd API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(get_announce, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def search_enroll(
+    access_token: Optional[str] = "",
+    std_id: Optional[str] = "",
+    academic_year: Optional[str] = "",
+    semester: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    schedule_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU enroll/searchEnrollResult API.
+
+    Assigning only (`login_response` and `schedule_response`) or `client` is acceptable.
+
+    API: https://myapi.ku.th/enroll/searchEnrollResult
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    std_id : Optional[str]
+        'stdId' attribute from login response, Represented by :class:`pymyku.attribute.Student.STD_ID`
+        , e.g. '20xxxx'
+    academic_year : Optional[str]
+        'academicYr' attribute from schedule response, Represented by :class:`pymyku.attribute.Schedule.ACADEMIC_YEAR`
+        , e.g. '2565'
+    semester : Optional[str]
+        'semester' attribute from schedule response, Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+        , e.g. '0' for summer, '1' for first semester and '2' for second semester.
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    schedule_response : Optional[Union[Response, dict]]
+        Schedule response from :meth:`get_schedule`,
+        Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from enroll/searchEnrollResult API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(search_enroll, **locals())
+
+    return await _send("POST", params, session, client)
+
+
+async def get_student_personal(
+    access_token: Optional[str] = "",
+    std_id: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU std-profile/getStdPersonal API.
+
+    Assigning only `login_response` or `client` is acceptable.
+
+    API: https://myapi.ku.th/std-profile/getStdPersonal
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    std_id : Optional[str]
+        'stdId' attribute from login response, Represented by :class:`pymyku.attribute.Student.STD_ID`
+        , e.g. '20xxxx'
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from std-profile/getStdPersonal API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(get_student_personal, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def get_student_education(
+    access_token: Optional[str] = "",
+    std_id: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU std-profile/getStdEducation API.
+
+    Assigning only `login_response` or `client` is acceptable.
+
+    API: https://myapi.ku.th/std-profile/getStdEducation
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    std_id : Optional[str]
+        'stdId' attribute from login response, Represented by :class:`pymyku.attribute.Student.STD_ID`
+        , e.g. '20xxxx'
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from std-profile/getStdEducation API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+    params = utils.gen_request_args_f(get_student_education, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def get_student_address(
+    access_token: Optional[str] = "",
+    std_id: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU std-profile/getStdAddress API.
+
+    Assigning only `login_response` or `client` is acceptable.
+
+    API: https://myapi.ku.th/std-profile/getStdAddress
+
+    Parameters
+    ----------
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    std_id : Optional[str]
+        'stdId' attribute from login response, Represented by :class:`pymyku.attribute.Student.STD_ID`
+        , e.g. '20xxxx'
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from std-profile/getStdAddress API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(get_student_address, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def search_subject(
+    query: str,
+    access_token: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU enroll/searchSubjectOpenEnr API.
+
+    Assigning only `login_response` or `client` is acceptable.
+
+    API: https://myapi.ku.th/enroll/searchSubjectOpenEnr
+
+    Parameters
+    ----------
+    query : str
+        Subject id or name to query. (At least 3 characters), e.g. '013', '01355119', 'eng' or 'english'
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from enroll/searchSubjectOpenEnr API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(search_subject, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def search_subject_open(
+    query: str,
+    section: Optional[str] = "",
+    access_token: Optional[str] = "",
+    campus_code: Optional[str] = "",
+    academic_year: Optional[str] = "",
+    semester: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    schedule_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU enroll/openSubjectForEnroll API.
+
+    Assigning only (`login_response` and `schedule_response`) or `client` is acceptable.
+
+    API: https://myapi.ku.th/enroll/openSubjectForEnroll
+
+    Parameters
+    ----------
+    query : str
+        Full subject id, e.g. '01355119' or '01355119-64'
+    section : Optional[str]
+        Section of the subject, e.g. '1'
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    campus_code : Optional[str]
+        'campusCode' attribute from login response, Represented by :class:`pymyku.attribute.Student.CAMPUS_CODE`,
+        e.g. Campus code, 'B' for Bang Khen, 'C' for Sakolkorn, 'I' for affiliated institute,
+        'K' for Kamphaeng Saen, 'P' for Suphanburi.
+    academic_year : Optional[str]
+        'academicYr' attribute from schedule response, Represented by :class:`pymyku.attribute.Schedule.ACADEMIC_YEAR`
+        , e.g. '2565'
+    semester : Optional[str]
+        'semester' attribute from schedule response, Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+        , e.g. '0' for summer, '1' for first semester and '2' for second semester.
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    schedule_response : Optional[Union[Response, dict]]
+        Schedule response from :meth:`get_schedule`,
+        Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from enroll/openSubjectForEnroll API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(search_subject_open, **locals())
+
+    return await _send("GET", params, session, client)
+
+
+async def search_section_detail(
+    section_id: str,
+    access_token: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> "aiohttp.ClientResponse":
+    """Send GET request to MyKU enroll/searchSectionDetail API.
+
+    API: https://myapi.ku.th/enroll/searchSectionDetail
+
+    Parameters
+    ----------
+    section_id : str
+        Section id. e.g. '186426'
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.AsyncClient` object
+    session : Optional[aiohttp.ClientSession]
+        Session to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    aiohttp.ClientResponse
+        Response object from enroll/searchSectionDetail API, with the body already read.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(search_section_detail, **locals())
+
+    return await _send("GET", params, session, client)
@@ -0,0 +1,388 @@
+import threading
+import time
+from collections import deque
+
+from . import deadline
+from .exception import BulkheadFull, CircuitOpen, DeadlineExceeded
+from .type import Callable, Dict, Optional, Response
+
+#: States of a circuit.
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit(object):
+    __slots__ = (
+        "state",
+        "calls",
+        "opened_at",
+        "trials",
+        "successes",
+        "opened",
+        "rejected",
+    )
+
+    def __init__(self) -> None:
+        self.state: str = CLOSED
+        #: (time, failed) of the recent calls.
+        self.calls: deque = deque()
+        self.opened_at: float = 0.0
+        #: Trial calls let through and succeeded in the current half open period.
+        self.trials: int = 0
+        self.successes: int = 0
+        self.opened: int = 0
+        self.rejected: int = 0
+
+
+class CircuitBreaker(object):
+    """Circuit breaker per API that fails fast while an API is failing or too slow.
+
+    The calls of every API in the last `window` seconds are tracked. Once there are at least
+    `minimum_calls` of them and the share of failed calls reaches `failure_rate`, the circuit opens
+    and the requests to the API raise :class:`pymyku.exception.CircuitOpen` without being sent.
+    After `open_seconds`, `half_open_calls` trial requests are let through:
+    the circuit closes once they all succeed and opens again if one fails.
+    Calls sent before the circuit opened do not count as trials.
+
+    A call fails when it raises a connection error or timeout, answers 429 or 5xx,
+    or takes more than `slow_call` seconds.
+
+    Pass the breaker to :class:`pymyku.Session` to guard every request sent through the session.
+
+    Parameters
+    ----------
+    failure_rate : float
+        Share of failed calls opening the circuit, by default 0.5
+    minimum_calls : int
+        Minimum number of calls in the window before the circuit can open, by default 10
+    window : float
+        Seconds of calls tracked, by default 30
+    open_seconds : float
+        Seconds the circuit stays open before trial requests, by default 30
+    half_open_calls : int
+        Number of trial requests, by default 1
+    slow_call : Optional[float]
+        Seconds after which a call counts as failed, by default calls are never too slow
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        minimum_calls: int = 10,
+        window: float = 30,
+        open_seconds: float = 30,
+        half_open_calls: int = 1,
+        slow_call: Optional[float] = None,
+    ) -> None:
+        self.__failure_rate: float = failure_rate
+        self.__minimum_calls: int = minimum_calls
+        self.__window: float = window
+        self.__open_seconds: float = open_seconds
+        self.__half_open_calls: int = half_open_calls
+        self.__slow_call: Optional[float] = slow_call
+        self.__circuits: Dict[str, _Circuit] = {}
+        self.__lock = threading.Lock()
+
+    def state(self, api: str) -> str:
+        """State of the circuit of an API.
+
+        Parameters
+        ----------
+        api : str
+            API, one of :mod:`pymyku.url`
+
+        Returns
+        -------
+        str
+            :attr:`CLOSED`, :attr:`OPEN` or :attr:`HALF_OPEN`
+        """
+
+        with self.__lock:
+            circuit = self.__circuits.get(api)
+
+            if circuit is None:
+                return CLOSED
+
+            if (
+                circuit.state == OPEN
+                and time.monotonic() - circuit.opened_at >= self.__open_seconds
+            ):
+                return HALF_OPEN
+
+            return circuit.state
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """State of every circuit.
+
+        Returns
+        -------
+        Dict[str, Dict[str, object]]
+            Per API, its `state`, the number of `calls` and `failures` in the window,
+            how many times it `opened` and the number of `rejected` requests.
+        """
+
+        with self.__lock:
+            apis = list(self.__circuits)
+
+        stats = {}
+
+        for api in apis:
+            state = self.state(api)
+
+            with self.__lock:
+                circuit = self.__circuits[api]
+                stats[api] = {
+                    "state": state,
+                    "calls": len(circuit.calls),
+                    "failures": sum(failed for _, failed in circuit.calls),
+                    "opened": circuit.opened,
+                    "rejected": circuit.rejected,
+                }
+
+        return stats
+
+    def reset(self, api: Optional[str] = None) -> None:
+        """Close the circuit of an API, or every circuit.
+
+        Parameters
+        ----------
+        api : Optional[str]
+            API, one of :mod:`pymyku.url`. By default every API.
+        """
+        with self.__lock:
+            if api is None:
+                self.__circuits.clear()
+            else:
+                self.__circuits.pop(api, None)
+
+    def call(self, api: str, send: Callable[[], Response]) -> Response:
+        """Send a request unless the circuit of its API is open, and record the outcome.
+
+        Parameters
+        ----------
+        api : str
+            API of the request, one of :mod:`pymyku.url`
+        send : Callable[[], Response]
+            Function sending the request.
+
+        Returns
+        -------
+        Response
+            The response.
+
+        Raises
+        ------
+        exception.CircuitOpen
+            The circuit of the API is open.
+        """
+
+        trial = self.__before(api)
+
+        start = time.monotonic()
+
+        try:
+            response = send()
+        except DeadlineExceeded:
+            # Out of time on our side, it says nothing about the health of the API.
+            self.__release(api, trial)
+            raise
+        except Exception:
+            self.__after(api, True, trial)
+            raise
+
+        failed = response.status_code == 429 or response.status_code >= 500
+
+        if self.__slow_call is not None and time.monotonic() - start > self.__slow_call:
+            failed = True
+
+        self.__after(api, failed, trial)
+
+        return response
+
+    def __before(self, api: str) -> Optional[int]:
+        """Admit a call, or raise if the circuit is open.
+
+        Returns the half open period of a trial call, as the number of times the circuit opened,
+        None for a call admitted while the circuit is closed.
+        """
+
+        with self.__lock:
+            circuit = self.__circuits.setdefault(api, _Circuit())
+
+            if circuit.state == OPEN:
+                if time.monotonic() - circuit.opened_at < self.__open_seconds:
+                    circuit.rejected += 1
+                    raise CircuitOpen(f"The circuit of {api} is open.")
+
+                circuit.state = HALF_OPEN
+                circuit.trials = 0
+                circuit.successes = 0
+
+            if circuit.state == HALF_OPEN:
+                if circuit.trials >= self.__half_open_calls:
+                    circuit.rejected += 1
+                    raise CircuitOpen(f"The circuit of {api} is half open.")
+
+                circuit.trials += 1
+                return circuit.opened
+
+            return None
+
+    @staticmethod
+    def __is_current(circuit: _Circuit, trial: Optional[int]) -> bool:
+        """Check if a trial call belongs to the current half open period of the circuit."""
+
+        return circuit.state == HALF_OPEN and circuit.opened == trial
+
+    def __release(self, api: str, trial: Optional[int]) -> None:
+        with self.__lock:
+            circuit = self.__circuits.get(api)
+
+            # A trial that did not finish lets another one through.
+            if circuit is not None and self.__is_current(circuit, trial):
+                circuit.trials -= 1
+
+    def __after(self, api: str, failed: bool, trial: Optional[int]) -> None:
+        now = time.monotonic()
+
+        with self.__lock:
+            circuit = self.__circuits.setdefault(api, _Circuit())
+
+            if trial is not None:
+                if not self.__is_current(circuit, trial):
+                    return
+
+                if failed:
+                    self.__open(circuit, now)
+                    return
+
+                circuit.successes += 1
+
+                if circuit.successes >= self.__half_open_calls:
+                    circuit.state = CLOSED
+                    circuit.calls.clear()
+                return
+
+            # Only the calls admitted and finished while closed fill the window.
+            if circuit.state != CLOSED:
+                return
+
+            circuit.calls.append((now, failed))
+
+            while circuit.calls and circuit.calls[0][0] < now - self.__window:
+                circuit.calls.popleft()
+
+            if len(circuit.calls) < self.__minimum_calls:
+                return
+
+            failures = sum(failed for _, failed in circuit.calls)
+
+            if failures / len(circuit.calls) >= self.__failure_rate:
+                self.__open(circuit, now)
+
+    @staticmethod
+    def __open(circuit: _Circuit, now: float) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.opened += 1
+        circuit.calls.clear()
+
+
+class Bulkhead(object):
+    """Cap of the concurrent requests per API, so that a slow API can not hold every thread and connection.
+
+    A request waits up to `timeout` seconds for a free slot of its API,
+    then raises :class:`pymyku.exception.BulkheadFull` without being sent.
+
+    Pass the bulkhead to :class:`pymyku.Session` to cap every request sent through the session.
+
+    Parameters
+    ----------
+    limits : Optional[Dict[str, int]]
+        Maximum number of concurrent requests per API (:mod:`pymyku.url`), by default none
+    default : Optional[int]
+        Maximum number of concurrent requests of the other APIs, by default unlimited
+    timeout : float
+        Seconds to wait for a free slot, by default 0
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        default: Optional[int] = None,
+        timeout: float = 0,
+    ) -> None:
+        self.__limits: Dict[str, int] = dict(limits or {})
+        self.__default: Optional[int] = default
+        self.__timeout: float = timeout
+        self.__semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self.__lock = threading.Lock()
+        self.__rejected: Dict[str, int] = {}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of rejected requests per API."""
+        with self.__lock:
+            return dict(self.__rejected)
+
+    def __semaphore(self, api: str) -> Optional[threading.BoundedSemaphore]:
+        limit = self.__limits.get(api, self.__default)
+
+        if limit is None:
+            return None
+
+        with self.__lock:
+            semaphore = self.__semaphores.get(api)
+
+            if semaphore is None:
+                semaphore = self.__semaphores[api] = threading.BoundedSemaphore(limit)
+
+            return semaphore
+
+    def call(self, api: str, send: Callable[[], Response]) -> Response:
+        """Send a request in a slot of its API.
+
+        Parameters
+        ----------
+        api : str
+            API of the request, one of :mod:`pymyku.url`
+        send : Callable[[], Response]
+            Function sending the request.
+
+        Returns
+        -------
+        Response
+            The response.
+
+        Raises
+        ------
+        exception.BulkheadFull
+            No slot of the API was free in time.
+        exception.DeadlineExceeded
+            No slot of the API was free before the deadline of the thread, see :class:`pymyku.Deadline`.
+        """
+
+        semaphore = self.__semaphore(api)
+
+        if semaphore is None:
+            return send()
+
+        left = deadline.remaining()
+        capped = left is not None and left < self.__timeout
+
+        if not semaphore.acquire(timeout=left if capped else self.__timeout):
+            with self.__lock:
+                self.__rejected[api] = self.__rejected.get(api, 0) + 1
+
+            if capped:
+                raise DeadlineExceeded(
+                    f"No slot of {api} was free before the deadline."
+                )
+            raise BulkheadFull(f"Too many concurrent requests to {api}.")
+
+        try:
+            return send()
+        finally:
+            semaphore.release()
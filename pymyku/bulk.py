@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from . import deadline
+from .type import Any, BulkResult, Callable, Hashable, Iterable, Iterator, Optional
+
+
+class Pacer(object):
+    """Space calls evenly so that at most `rate` calls start per second, across threads.
+
+    Parameters
+    ----------
+    rate : float
+        Maximum number of calls started per second.
+    """
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.__interval: float = 1 / rate
+        self.__next: float = 0.0
+        self.__lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next free slot."""
+
+        with self.__lock:
+            now = time.monotonic()
+            slot = max(self.__next, now)
+            self.__next = slot + self.__interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+    def wrap(self, function: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Return `function` paced by :meth:`wait`."""
+
+        def paced(key):
+            self.wait()
+            return function(key)
+
+        return paced
+
+
+def run(
+    function: Callable[[Any], Any],
+    keys: Iterable[Hashable],
+    max_workers: int = 8,
+    rate: Optional[float] = None,
+) -> Iterator[BulkResult]:
+    """Call `function` once for every distinct key on a bounded thread pool.
+
+    At most `max_workers` calls are in flight at the same time and the keys are consumed lazily,
+    so `keys` can be a generator. Results are yielded as soon as they finish.
+    An exception raised by a call is yielded in its result instead of being raised,
+    so one failing key does not stop the others.
+
+    Closing the iterator early cancels the calls that have not started yet.
+    Inside a :class:`pymyku.Deadline`, the calls run under it in the worker threads,
+    and the calls not started before it fail with :class:`pymyku.exception.DeadlineExceeded`
+    without being made.
+
+    Parameters
+    ----------
+    function : Callable[[Any], Any]
+        Function called with each key.
+    keys : Iterable[Hashable]
+        Keys to call the function with. Duplicated keys are called once.
+    max_workers : int
+        Maximum number of concurrent calls, by default 8
+    rate : Optional[float]
+        Maximum number of calls started per second, by default unlimited
+
+    Yields
+    ------
+    BulkResult
+        Key with the result or the exception of its call, in completion order.
+
+    Raises
+    ------
+    ValueError
+        max_workers is less than 1.
+    """
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    if rate is not None:
+        function = Pacer(rate).wrap(function)
+
+    bound = deadline.current()
+
+    if bound is not None:
+        function = bound.wrap(function)
+
+    keys = iter(keys)
+    seen = set()
+    pending = {}
+
+    def submit() -> bool:
+        for key in keys:
+            if key in seen:
+                continue
+            seen.add(key)
+            pending[executor.submit(function, key)] = key
+            return True
+        return False
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    try:
+        while len(pending) < max_workers and submit():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                key = pending.pop(future)
+                error = future.exception()
+
+                if error is None:
+                    yield BulkResult(key, future.result(), None)
+                else:
+                    yield BulkResult(key, None, error)
+
+                submit()
+    finally:
+        for future in pending:
+            future.cancel()
+
+        executor.shutdown(wait=False)
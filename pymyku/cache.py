@@ -0,0 +1,1182 @@
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.structures import CaseInsensitiveDict
+
+from . import url, utils
+from ._sqlite import Transaction
+from .type import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Response,
+    Tuple,
+)
+
+#: Default time to live in seconds of the cached responses of each API.
+#: APIs that are not listed are not cached.
+DEFAULT_TTL: Dict[str, float] = {
+    url.SCHEDULE: 24 * 60 * 60,
+    url.SEARCH_SUBJECT: 60 * 60,
+    url.SEARCH_SUBJECT_OPEN: 60,
+    url.SEARCH_SECTION_DETAIL: 60,
+    url.STUDENT_PERSONAL: 24 * 60 * 60,
+    url.STUDENT_EDUCATION: 24 * 60 * 60,
+    url.STUDENT_ADDRESS: 24 * 60 * 60,
+    url.GROUP_COURSE: 60 * 60,
+    url.CHECK_GRADES: 60 * 60,
+    url.GPAX: 60 * 60,
+    url.ANNOUNCE: 5 * 60,
+    url.SEARCH_ENROLL: 5 * 60,
+}
+
+#: Default time to live in seconds of the negative responses of each API,
+#: empty results or not found errors such as a subject or section that does not exist.
+#: APIs that are not listed do not cache negative responses.
+DEFAULT_NEGATIVE_TTL: Dict[str, float] = {
+    url.SEARCH_SUBJECT: 5 * 60,
+    url.SEARCH_SECTION_DETAIL: 5 * 60,
+}
+
+#: Status codes of the errors proving that the requested resource does not exist,
+#: the only errors cached as negative responses.
+NEGATIVE_STATUSES: Tuple[int, ...] = (404, 410)
+
+#: Authentication APIs whose responses carry credentials and are never cached,
+#: whatever the time to live given to :class:`ResponseCache`.
+NEVER_CACHED: Tuple[str, ...] = (
+    url.LOGIN,
+    url.LOGOUT,
+    url.RENEW,
+)
+
+#: Time to live of the responses that never change.
+FOREVER: float = float("inf")
+
+#: APIs queried by academic year and semester whose responses for a past semester never change.
+#: Their responses for a semester before :attr:`ResponseCache.current_semester` are cached :attr:`FOREVER`.
+IMMUTABLE_PAST: Tuple[str, ...] = (
+    url.ANNOUNCE,
+    url.SEARCH_ENROLL,
+    url.GROUP_COURSE,
+)
+
+
+class CachedResponse(Response):
+    """A cached response that parses its JSON body once.
+
+    The parsed body is kept pickled, so every call of :meth:`json` returns a new copy
+    that the caller can modify without changing the cache, faster than parsing the body again.
+    """
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CachedResponse":
+        """Wrap a response, its body is read.
+
+        Parameters
+        ----------
+        response : Response
+            The response to wrap.
+
+        Returns
+        -------
+        CachedResponse
+            The cached response, `response` itself if it is already cached.
+        """
+
+        if isinstance(response, cls):
+            return response
+
+        # Read the body now, so that the connection goes back to the pool.
+        response.content
+
+        cached = cls.__new__(cls)
+        cached.__dict__.update(response.__dict__)
+
+        return cached
+
+    def json(self, **kwargs) -> Any:
+        if kwargs:
+            return super().json(**kwargs)
+
+        try:
+            parsed = self.__parsed
+        except AttributeError:
+            data = super().json()
+            self.__parsed = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+            return data
+
+        return pickle.loads(parsed)
+
+
+class CacheEntry(NamedTuple):
+    """A cached response."""
+
+    #: API of the response.
+    url: str
+    #: The cached response.
+    response: CachedResponse
+    #: Time (:func:`time.time`) after which the entry is expired.
+    expires: float
+
+    @property
+    def fresh(self) -> bool:
+        """True if the entry has not expired yet."""
+        return time.time() < self.expires
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers revalidating the entry, from its ETag and Last-Modified headers."""
+
+        headers = {}
+        etag = self.response.headers.get("ETag")
+        last_modified = self.response.headers.get("Last-Modified")
+
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        return headers
+
+
+class SQLiteCache(object):
+    """Persistent storage of cached responses in a SQLite database.
+
+    Used as the `storage` of a :class:`ResponseCache`, cached responses survive process restarts
+    and are shared by every process using the same database file.
+    The database runs in WAL mode, so readers never block the writer.
+
+    Parameters
+    ----------
+    path : str
+        Path of the database file, created if it does not exist.
+    max_bytes : Optional[int]
+        Maximum total size of the cached bodies. The least recently used responses
+        are evicted first, by default 64 MiB. None for no limit.
+    timeout : float
+        Seconds to wait for another process holding the write lock, by default 10
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        timeout: float = 10,
+    ) -> None:
+        self.__path: str = path
+        self.__max_bytes: Optional[int] = max_bytes
+        self.__timeout: float = timeout
+        self.__local = threading.local()
+
+        with self.__transaction() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    expires REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    status INTEGER NOT NULL,
+                    reason TEXT,
+                    url TEXT,
+                    encoding TEXT,
+                    headers TEXT NOT NULL,
+                    content BLOB NOT NULL
+                )
+                """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_endpoint ON responses (endpoint)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+
+    @property
+    def path(self) -> str:
+        """Path of the database file."""
+        return self.__path
+
+    def __connection(self) -> sqlite3.Connection:
+        """Connection of the current thread, connections can not be shared between threads."""
+
+        connection = getattr(self.__local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(
+                self.__path, timeout=self.__timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.__local.connection = connection
+
+        return connection
+
+    def __transaction(self) -> Transaction:
+        return Transaction(self.__connection())
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get a stored entry, expired or not, and mark it as recently used.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from :meth:`pymyku.utils.gen_cache_key`
+
+        Returns
+        -------
+        Optional[CacheEntry]
+            The entry, None if the key is not stored.
+        """
+
+        connection = self.__connection()
+
+        row = connection.execute(
+            "SELECT endpoint, expires, status, reason, url, encoding, headers, content "
+            "FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        with self.__transaction() as connection:
+            connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+
+        return CacheEntry(row[0], _load_response(*row[2:]), row[1])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry and evict the least recently used entries above `max_bytes`.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from :meth:`pymyku.utils.gen_cache_key`
+        entry : CacheEntry
+            The entry to store.
+        """
+
+        response = entry.response
+        content = response.content or b""
+
+        with self.__transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, expires, accessed, size, status, reason, url, encoding, headers, content) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.url,
+                    entry.expires,
+                    time.time(),
+                    len(content),
+                    response.status_code,
+                    response.reason,
+                    response.url,
+                    response.encoding,
+                    json.dumps(dict(response.headers)),
+                    sqlite3.Binary(content),
+                ),
+            )
+
+            if self.__max_bytes is not None:
+                self.__evict(connection)
+
+    def touch(self, key: str, expires: float) -> None:
+        """Extend the expiry of a stored entry that has been revalidated.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from :meth:`pymyku.utils.gen_cache_key`
+        expires : float
+            New expiry time (:func:`time.time`).
+        """
+
+        with self.__transaction() as connection:
+            connection.execute(
+                "UPDATE responses SET expires = ?, accessed = ? WHERE key = ?",
+                (expires, time.time(), key),
+            )
+
+    def __evict(self, connection: sqlite3.Connection) -> None:
+        """Delete expired entries, then the least recently used ones, until under `max_bytes`."""
+
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        if total <= self.__max_bytes:
+            return
+
+        connection.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+
+        rows = connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed DESC"
+        ).fetchall()
+
+        total = 0
+        evicted = []
+
+        for key, size in rows:
+            total += size
+            if total > self.__max_bytes:
+                evicted.append((key,))
+
+        connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def entries(self, limit: Optional[int] = None) -> Iterator[tuple]:
+        """Iterate over the fresh stored entries, most recently used first.
+
+        Parameters
+        ----------
+        limit : Optional[int]
+            Maximum number of entries, by default all of them.
+
+        Yields
+        ------
+        Tuple[str, CacheEntry]
+            Cache key and entry.
+        """
+
+        rows = self.__connection().execute(
+            "SELECT key, endpoint, expires, status, reason, url, encoding, headers, content "
+            "FROM responses WHERE expires > ? ORDER BY accessed DESC LIMIT ?",
+            (time.time(), -1 if limit is None else limit),
+        )
+
+        for row in rows:
+            yield row[0], CacheEntry(row[1], _load_response(*row[3:]), row[2])
+
+    def invalidate(self, api: Optional[str] = None) -> int:
+        """Delete the stored responses of an API, or every stored response.
+
+        Parameters
+        ----------
+        api : Optional[str]
+            API to invalidate, one of :mod:`pymyku.url`. By default every API.
+
+        Returns
+        -------
+        int
+            Number of deleted responses.
+        """
+
+        with self.__transaction() as connection:
+            if api is None:
+                return connection.execute("DELETE FROM responses").rowcount
+
+            return connection.execute(
+                "DELETE FROM responses WHERE endpoint = ?", (api,)
+            ).rowcount
+
+    def close(self) -> None:
+        """Close the connection of the current thread."""
+
+        connection = getattr(self.__local, "connection", None)
+
+        if connection is not None:
+            connection.close()
+            self.__local.connection = None
+
+
+def _load_response(
+    status: int,
+    reason: Optional[str],
+    response_url: Optional[str],
+    encoding: Optional[str],
+    headers: str,
+    content: bytes,
+) -> Response:
+    """Rebuild a response stored by :class:`SQLiteCache`."""
+
+    response = CachedResponse()
+    response.status_code = status
+    response.reason = reason
+    response.url = response_url
+    response.encoding = encoding
+    response.headers = CaseInsensitiveDict(json.loads(headers))
+    response._content = bytes(content)
+
+    return response
+
+
+def is_negative(response: Response) -> bool:
+    """Check if a response is a negative answer, which is worth caching for a short time only.
+
+    A negative answer is an error in :attr:`NEGATIVE_STATUSES`, proving that the resource does not exist,
+    or a successful JSON response whose results are all empty.
+    Authentication and session errors, such as an expired token, are never negative.
+
+    Parameters
+    ----------
+    response : Response
+        The response to check.
+
+    Returns
+    -------
+    bool
+        True if the response is negative.
+    """
+
+    if utils.is_token_expired(response):
+        return False
+
+    if response.status_code in NEGATIVE_STATUSES:
+        return True
+
+    if response.status_code != 200:
+        return False
+
+    try:
+        data = response.json()
+    except ValueError:
+        return False
+
+    if not isinstance(data, dict):
+        return not data
+
+    return not any(value for key, value in data.items() if key != "code")
+
+
+class ResponseCache(object):
+    """In-memory cache of MyKU responses with a time to live per API and a least recently used bound.
+
+    Responses are keyed on the request generated by :meth:`pymyku.utils.gen_request_args_f`,
+    see :meth:`pymyku.utils.gen_cache_key`. Only successful (200) responses are cached.
+
+    An expired response with an ETag or Last-Modified header is revalidated with a conditional request,
+    a 304 Not Modified answer renews it without downloading nor parsing the body again.
+
+    Pass the cache to :class:`pymyku.Client` to cache the requests of the client.
+
+    With a :class:`SQLiteCache` as `storage`, every cached response is also written to disk
+    and responses missing from memory are read from it, so a new process starts warm.
+
+    With `stale_while_revalidate`, a response expired for less than that many seconds is returned at once
+    while it is refreshed in the background. With `refresh_ahead`, a response read during the last
+    `refresh_ahead` seconds of its time to live is refreshed in the background before it expires.
+    At most `max_background` background refreshes run at the same time, others are skipped.
+
+    Negative responses (see :func:`is_negative`) of the APIs in `negative_ttl` are kept apart from
+    the other responses, in memory only, for their own shorter time to live.
+
+    Parameters
+    ----------
+    ttl : Optional[Dict[str, float]]
+        Time to live in seconds per API (:mod:`pymyku.url`), merged over :attr:`DEFAULT_TTL`.
+        A time to live of 0 disables caching of the API.
+    default_ttl : Optional[float]
+        Time to live of the data APIs that are not in `ttl` nor :attr:`DEFAULT_TTL`, by default not cached.
+        The authentication APIs in :attr:`NEVER_CACHED` are never cached.
+    maxsize : int
+        Maximum number of cached responses, the least recently used ones are evicted first, by default 1024
+    storage : Optional[SQLiteCache]
+        Persistent second level of the cache, by default none.
+    current_semester : Optional[Tuple[str, str]]
+        Current academic year and semester, set by :class:`pymyku.Client` when it is initialized.
+        Responses of :attr:`IMMUTABLE_PAST` APIs for earlier semesters are cached :attr:`FOREVER`.
+    stale_while_revalidate : float
+        Seconds after expiry during which a response is still returned while it is refreshed, by default 0
+    refresh_ahead : float
+        Seconds before expiry from which a read response is refreshed in the background, by default 0
+    max_background : int
+        Maximum number of concurrent background refreshes, by default 2
+    negative_ttl : Optional[Dict[str, float]]
+        Time to live in seconds of negative responses per API, merged over :attr:`DEFAULT_NEGATIVE_TTL`.
+        A time to live of 0 disables negative caching of the API.
+    negative_maxsize : int
+        Maximum number of cached negative responses, by default 256
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[Dict[str, float]] = None,
+        default_ttl: Optional[float] = None,
+        maxsize: int = 1024,
+        storage: Optional[SQLiteCache] = None,
+        current_semester: Optional[Tuple[str, str]] = None,
+        stale_while_revalidate: float = 0,
+        refresh_ahead: float = 0,
+        max_background: int = 2,
+        negative_ttl: Optional[Dict[str, float]] = None,
+        negative_maxsize: int = 256,
+    ) -> None:
+        self.__ttl: Dict[str, float] = dict(DEFAULT_TTL)
+        self.__ttl.update(ttl or {})
+        self.__default_ttl: Optional[float] = default_ttl
+        self.__maxsize: int = maxsize
+        self.__storage: Optional[SQLiteCache] = storage
+        self.__current_semester: Optional[Tuple[int, int]] = None
+        self.current_semester = current_semester
+        self.__entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+        self.__revalidations: int = 0
+        self.__bytes_saved: int = 0
+        self.__stale_while_revalidate: float = stale_while_revalidate
+        self.__refresh_ahead: float = refresh_ahead
+        self.__max_background: int = max_background
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__refreshing: set = set()
+        self.__stale_hits: int = 0
+        self.__background_refreshes: int = 0
+        self.__background_skipped: int = 0
+        self.__background_errors: int = 0
+        self.__negative_ttl: Dict[str, float] = dict(DEFAULT_NEGATIVE_TTL)
+        self.__negative_ttl.update(negative_ttl or {})
+        self.__negative_maxsize: int = negative_maxsize
+        self.__negatives: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.__negative_hits: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def storage(self) -> Optional[SQLiteCache]:
+        """Persistent second level of the cache, if any."""
+        return self.__storage
+
+    @property
+    def current_semester(self) -> Optional[Tuple[int, int]]:
+        """Current semester as a :meth:`pymyku.utils.semester_key`, None if unknown."""
+        return self.__current_semester
+
+    @current_semester.setter
+    def current_semester(self, value: Optional[Tuple[str, str]]) -> None:
+        self.__current_semester = None if value is None else utils.semester_key(*value)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache usage.
+
+        Returns
+        -------
+        Dict[str, int]
+            Number of `hits`, `misses`, `evictions`, `revalidations` (304 answers), cached `entries`
+            and `bytes_saved`, the size of the bodies answered from the cache.
+            `stale_hits` counts the expired responses returned while refreshed, `background_refreshes`,
+            `background_skipped` and `background_errors` count the background refreshes
+            that were started, skipped because `max_background` were running, and that failed.
+            `negative_hits` and `negative_entries` count the negative responses answered and cached.
+        """
+        with self.__lock:
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "evictions": self.__evictions,
+                "revalidations": self.__revalidations,
+                "entries": len(self.__entries),
+                "bytes_saved": self.__bytes_saved,
+                "stale_hits": self.__stale_hits,
+                "background_refreshes": self.__background_refreshes,
+                "background_skipped": self.__background_skipped,
+                "background_errors": self.__background_errors,
+                "negative_hits": self.__negative_hits,
+                "negative_entries": len(self.__negatives),
+            }
+
+    def ttl_for(self, api: str, params: dict) -> Optional[float]:
+        """Time to live of a response.
+
+        Parameters
+        ----------
+        api : str
+            API of the request, one of :mod:`pymyku.url`
+        params : dict
+            Request parameters generated by :meth:`pymyku.utils.gen_request_args_f`
+
+        Returns
+        -------
+        Optional[float]
+            Time to live in seconds, None or 0 if the response must not be cached.
+        """
+        if api in NEVER_CACHED:
+            return None
+
+        ttl = self.__ttl.get(api, self.__default_ttl)
+
+        if ttl and api in IMMUTABLE_PAST and self.__current_semester is not None:
+            query = params.get("params") or params.get("data") or {}
+
+            try:
+                key = utils.semester_key(query["academicYear"], query["semester"])
+            except (KeyError, TypeError, ValueError):
+                return ttl
+
+            if key < self.__current_semester:
+                return FOREVER
+
+        return ttl
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get a cached entry, expired or not, and mark it as recently used.
+
+        An entry missing from memory is read from the storage and kept in memory.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from :meth:`pymyku.utils.gen_cache_key`
+
+        Returns
+        -------
+        Optional[CacheEntry]
+            The entry, None if the key is not cached.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None:
+                self.__entries.move_to_end(key)
+                return entry
+
+        if self.__storage is None:
+            return None
+
+        entry = self.__storage.get(key)
+
+        if entry is not None:
+            self.__put(key, entry)
+
+        return entry
+
+    def __put(self, key: str, entry: CacheEntry) -> None:
+        """Keep an entry in memory and evict the least recently used entries above `maxsize`."""
+
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.__maxsize:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def set(self, key: str, api: str, response: Response, ttl: float) -> None:
+        """Cache a response.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from :meth:`pymyku.utils.gen_cache_key`
+        api : str
+            API of the response, one of :mod:`pymyku.url`
+        response : Response
+            The response to cache. Its body is read.
+        ttl : float
+            Time to live in seconds.
+        """
+
+        entry = CacheEntry(
+            api, CachedResponse.from_response(response), time.time() + ttl
+        )
+
+        self.__put(key, entry)
+
+        if self.__storage is not None:
+            self.__storage.set(key, entry)
+
+    def warm(self, limit: Optional[int] = None) -> int:
+        """Load the fresh responses of the storage into memory.
+
+        Parameters
+        ----------
+        limit : Optional[int]
+            Maximum number of responses to load, by default up to `maxsize`.
+
+        Returns
+        -------
+        int
+            Number of loaded responses.
+        """
+
+        if self.__storage is None:
+            return 0
+
+        if limit is None:
+            limit = self.__maxsize
+
+        entries = list(self.__storage.entries(min(limit, self.__maxsize)))
+
+        # Least recently used first, so that the most recently used entries end up last in the LRU order.
+        for key, entry in reversed(entries):
+            self.__put(key, entry)
+
+        return len(entries)
+
+    def invalidate(self, api: Optional[str] = None) -> int:
+        """Remove the cached responses of an API, or every cached response.
+
+        Parameters
+        ----------
+        api : Optional[str]
+            API to invalidate, one of :mod:`pymyku.url`. By default every API.
+
+        Returns
+        -------
+        int
+            Number of removed responses, in memory or in the storage.
+        """
+        with self.__lock:
+            if api is None:
+                keys = list(self.__entries)
+            else:
+                keys = [
+                    key for key, entry in self.__entries.items() if entry.url == api
+                ]
+
+            for key in keys:
+                del self.__entries[key]
+
+            negatives = [
+                key
+                for key, entry in self.__negatives.items()
+                if api is None or entry.url == api
+            ]
+
+            for key in negatives:
+                del self.__negatives[key]
+
+            keys.extend(negatives)
+
+        if self.__storage is None:
+            return len(keys)
+
+        return max(len(keys), self.__storage.invalidate(api))
+
+    def clear(self) -> None:
+        """Remove every cached response, in memory and in the storage, and reset the statistics."""
+
+        if self.__storage is not None:
+            self.__storage.invalidate()
+
+        with self.__lock:
+            self.__entries.clear()
+            self.__negatives.clear()
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
+            self.__revalidations = 0
+            self.__bytes_saved = 0
+            self.__stale_hits = 0
+            self.__background_refreshes = 0
+            self.__background_skipped = 0
+            self.__background_errors = 0
+            self.__negative_hits = 0
+
+    def request(
+        self,
+        method: str,
+        params: dict,
+        send: Callable[[dict], Response],
+        identity: Optional[str] = None,
+    ) -> Response:
+        """Answer a request from the cache, or send it and cache the response.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+        params : dict
+            Request parameters generated by :meth:`pymyku.utils.gen_request_args_f`
+        send : Callable[[dict], Response]
+            Function sending the request parameters.
+        identity : Optional[str]
+            Identity of the user sending the request, e.g. the student code.
+
+        Returns
+        -------
+        Response
+            The cached or the new response.
+        """
+
+        api = params.get("url")
+        ttl = self.ttl_for(api, params)
+
+        if not ttl:
+            return send(params)
+
+        key = utils.gen_cache_key(method, params, identity)
+        entry = self.get(key)
+        now = time.time()
+
+        if entry is not None and now < entry.expires + self.__stale_while_revalidate:
+            with self.__lock:
+                self.__hits += 1
+                self.__bytes_saved += len(entry.response.content)
+
+                if now >= entry.expires:
+                    self.__stale_hits += 1
+
+            if now >= entry.expires - self.__refresh_ahead:
+                self.__refresh_in_background(key, api, params, send, entry, ttl)
+
+            return entry.response
+
+        # Negatives are never shared between users, even for the public APIs.
+        negative_key = json.dumps([identity, key])
+
+        with self.__lock:
+            negative = self.__negatives.get(negative_key)
+
+            if negative is not None and now < negative.expires:
+                self.__negatives.move_to_end(negative_key)
+                self.__negative_hits += 1
+                return negative.response
+
+            self.__misses += 1
+
+        return self.__fetch(key, api, params, send, entry, ttl, negative_key)
+
+    def close(self) -> None:
+        """Stop the background refreshes that have not started yet."""
+
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __fetch(
+        self,
+        key: str,
+        api: str,
+        params: dict,
+        send: Callable[[dict], Response],
+        entry: Optional[CacheEntry],
+        ttl: float,
+        negative_key: Optional[str] = None,
+    ) -> Response:
+        """Send a request, conditional if `entry` has validators, and cache the response.
+
+        A negative response is cached under `negative_key`, not at all without it.
+        """
+
+        validators = entry.validators if entry is not None else None
+
+        if validators:
+            headers = dict(params.get("headers") or {})
+            headers.update(validators)
+            response = send(dict(params, headers=headers))
+        else:
+            response = send(params)
+
+        if response.status_code == 304 and validators:
+            response.close()
+            self.__revalidate(key, entry, ttl)
+            return entry.response
+
+        negative_ttl = self.__negative_ttl.get(api)
+
+        if negative_key is not None and negative_ttl and is_negative(response):
+            response = CachedResponse.from_response(response)
+            self.__put_negative(
+                negative_key, CacheEntry(api, response, time.time() + negative_ttl)
+            )
+            return response
+
+        if response.status_code == 200:
+            response = CachedResponse.from_response(response)
+            self.set(key, api, response, ttl)
+
+            if negative_key is not None:
+                with self.__lock:
+                    self.__negatives.pop(negative_key, None)
+
+        return response
+
+    def __put_negative(self, key: str, entry: CacheEntry) -> None:
+        """Keep a negative entry and evict the least recently used ones above `negative_maxsize`."""
+
+        with self.__lock:
+            self.__negatives[key] = entry
+            self.__negatives.move_to_end(key)
+
+            while len(self.__negatives) > self.__negative_maxsize:
+                self.__negatives.popitem(last=False)
+
+    def __refresh_in_background(
+        self,
+        key: str,
+        api: str,
+        params: dict,
+        send: Callable[[dict], Response],
+        entry: CacheEntry,
+        ttl: float,
+    ) -> None:
+        """Refresh an entry on the background pool, unless it is already refreshing or the pool is full."""
+
+        with self.__lock:
+            if key in self.__refreshing:
+                return
+
+            if len(self.__refreshing) >= self.__max_background:
+                self.__background_skipped += 1
+                return
+
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.__max_background,
+                    thread_name_prefix="pymyku-cache",
+                )
+
+            self.__refreshing.add(key)
+            self.__background_refreshes += 1
+            executor = self.__executor
+
+        try:
+            executor.submit(self.__background_fetch, key, api, params, send, entry, ttl)
+        except RuntimeError:
+            # The cache was closed meanwhile.
+            with self.__lock:
+                self.__refreshing.discard(key)
+
+    def __background_fetch(
+        self,
+        key: str,
+        api: str,
+        params: dict,
+        send: Callable[[dict], Response],
+        entry: CacheEntry,
+        ttl: float,
+    ) -> None:
+        try:
+            self.__fetch(key, api, params, send, entry, ttl)
+        except Exception:
+            with self.__lock:
+                self.__background_errors += 1
+        finally:
+            with self.__lock:
+                self.__refreshing.discard(key)
+
+    def __revalidate(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        """Renew an entry confirmed by a 304 Not Modified answer."""
+
+        entry = entry._replace(expires=time.time() + ttl)
+
+        self.__put(key, entry)
+
+        if self.__storage is not None:
+            self.__storage.touch(key, entry.expires)
+
+        with self.__lock:
+            self.__revalidations += 1
+            self.__bytes_saved += len(entry.response.content)
+
+
+class _PrefixEntry(NamedTuple):
+    subjects: List[dict]
+    authoritative: bool
+    expires: float
+
+
+def matches_subject(subject: dict, query: str) -> bool:
+    """Check if a subject matches a :meth:`pymyku.Client.search_subject` query.
+
+    A subject matches if its id starts with the query or its English or Thai name contains it, ignoring case.
+
+    Parameters
+    ----------
+    subject : dict
+        Subject dict returned by :meth:`pymyku.Client.search_subject`
+    query : str
+        The query.
+
+    Returns
+    -------
+    bool
+        True if the subject matches.
+    """
+
+    query = query.strip().lower()
+
+    if str(subject.get("subjectCode", "")).lower().startswith(query):
+        return True
+
+    return any(
+        query in str(subject.get(name) or "").lower()
+        for name in ("subjectNameEn", "subjectNameTh")
+    )
+
+
+class PrefixCache(object):
+    """Cache of :meth:`pymyku.Client.search_subject` results that answers refined queries locally.
+
+    The subjects matching a query are a subset of the subjects matching any prefix of it,
+    e.g. '01355' is answered from the result of '013' with :func:`matches_subject`.
+    Only authoritative results, holding every matching subject, answer longer queries.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of cached queries, the least recently used ones are evicted first, by default 256
+    ttl : float
+        Time to live in seconds of the cached results, by default 1 hour
+    max_results : Optional[int]
+        Number of results from which the API may have truncated a result, which is then not authoritative.
+        By default every result is authoritative.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 60 * 60,
+        max_results: Optional[int] = None,
+    ) -> None:
+        self.__maxsize: int = maxsize
+        self.__ttl: float = ttl
+        self.__max_results: Optional[int] = max_results
+        self.__entries: "OrderedDict[str, _PrefixEntry]" = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits: int = 0
+        self.__prefix_hits: int = 0
+        self.__misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache usage.
+
+        Returns
+        -------
+        Dict[str, int]
+            Number of exact `hits`, `prefix_hits` answered by filtering a shorter query,
+            `misses` and cached `entries`.
+        """
+        with self.__lock:
+            return {
+                "hits": self.__hits,
+                "prefix_hits": self.__prefix_hits,
+                "misses": self.__misses,
+                "entries": len(self.__entries),
+            }
+
+    def get(self, query: str) -> Optional[List[dict]]:
+        """Answer a query from its cached result, or by filtering the result of its longest authoritative prefix.
+
+        Parameters
+        ----------
+        query : str
+            Subject id or name to query.
+
+        Returns
+        -------
+        Optional[List[dict]]
+            List of subject dicts, None if the query can not be answered locally.
+        """
+
+        query = query.strip().lower()
+        now = time.time()
+
+        with self.__lock:
+            for end in range(len(query), 0, -1):
+                stem = query[:end]
+                entry = self.__entries.get(stem)
+
+                if entry is None or entry.expires <= now:
+                    continue
+
+                if end == len(query):
+                    self.__entries.move_to_end(stem)
+                    self.__hits += 1
+                    return [dict(subject) for subject in entry.subjects]
+
+                if entry.authoritative:
+                    self.__entries.move_to_end(stem)
+                    self.__prefix_hits += 1
+                    break
+            else:
+                self.__misses += 1
+                return None
+
+        return [
+            dict(subject)
+            for subject in entry.subjects
+            if matches_subject(subject, query)
+        ]
+
+    def set(
+        self, query: str, subjects: List[dict], authoritative: Optional[bool] = None
+    ) -> None:
+        """Cache the result of a query.
+
+        Parameters
+        ----------
+        query : str
+            Subject id or name that was queried.
+        subjects : List[dict]
+            List of subject dicts returned for the query.
+        authoritative : Optional[bool]
+            Whether the result holds every matching subject,
+            by default True unless it has `max_results` subjects or more.
+        """
+
+        if authoritative is None:
+            authoritative = (
+                self.__max_results is None or len(subjects) < self.__max_results
+            )
+
+        query = query.strip().lower()
+        # Copied in and out, so callers can modify their subjects without changing the cache.
+        entry = _PrefixEntry(
+            [dict(subject) for subject in subjects],
+            authoritative,
+            time.time() + self.__ttl,
+        )
+
+        with self.__lock:
+            self.__entries[query] = entry
+            self.__entries.move_to_end(query)
+
+            while len(self.__entries) > self.__maxsize:
+                self.__entries.popitem(last=False)
+
+    def mark_authoritative(self, query: str, authoritative: bool = True) -> bool:
+        """Mark the cached result of a query as holding every matching subject, or not.
+
+        Parameters
+        ----------
+        query : str
+            Subject id or name that was queried.
+        authoritative : bool
+            Whether the result is authoritative, by default True
+
+        Returns
+        -------
+        bool
+            False if the query is not cached.
+        """
+
+        query = query.strip().lower()
+
+        with self.__lock:
+            entry = self.__entries.get(query)
+
+            if entry is None:
+                return False
+
+            self.__entries[query] = entry._replace(authoritative=authoritative)
+            return True
+
+    def clear(self) -> None:
+        """Remove every cached result and reset the statistics."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__prefix_hits = 0
+            self.__misses = 0
@@ -0,0 +1,599 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from operator import itemgetter
+
+from .type import Dict, Iterable, Iterator, List, Optional, Set, SubjectMatch, Tuple
+
+#: Keys of the subject fields kept by :class:`SubjectCatalog`.
+SUBJECT_FIELDS = ("subjectCode", "subjectNameEn", "subjectNameTh")
+
+#: Length of the character n-grams of the fuzzy name index.
+NGRAM_SIZE = 3
+
+#: N-grams of more names than this are too common for :meth:`SubjectCatalog.search_fuzzy`
+#: to look for candidates with them, they are only compared.
+FUZZY_COMMON_NGRAM = 1000
+
+#: Maximum number of names compared with the query by :meth:`SubjectCatalog.search_fuzzy`.
+FUZZY_CANDIDATES = 500
+
+#: Words, Thai vowel and tone marks included as they are not alphanumeric.
+_TOKEN = re.compile(r"[\w\u0e00-\u0e7f]+")
+
+#: Thai tone marks and other signs that are often left out when typing:
+#: maitaikhu, mai ek, mai tho, mai tri, mai chattawa, thanthakhat, nikhahit, yamakkan.
+_THAI_MARKS = {code: None for code in range(0x0E47, 0x0E4F)}
+
+#: Thai vowels folded to the variant they are commonly confused with.
+_THAI_VOWELS = {
+    ord("\u0e35"): "\u0e34",  # sara ii -> sara i
+    ord("\u0e37"): "\u0e36",  # sara uee -> sara ue
+    ord("\u0e39"): "\u0e38",  # sara uu -> sara u
+    ord("\u0e33"): "\u0e32",  # sara am -> sara aa
+    ord("\u0e30"): None,  # sara a
+}
+
+_NORMALIZE = dict(_THAI_MARKS)
+_NORMALIZE.update(_THAI_VOWELS)
+
+
+def tokenize(name: str) -> List[str]:
+    """Split a subject name into lower case word tokens.
+
+    Thai is written without spaces between words, so a Thai name is usually a few long tokens,
+    found by :meth:`SubjectCatalog.search_name` with a prefix of the token.
+
+    Parameters
+    ----------
+    name : str
+        English or Thai subject name.
+
+    Returns
+    -------
+    List[str]
+        Tokens of the name.
+    """
+
+    return _TOKEN.findall(name.lower())
+
+
+def normalize(text: str) -> str:
+    """Normalize a subject name for fuzzy search.
+
+    English is lower cased, Thai tone marks are removed and Thai vowel variants are folded,
+    punctuation and repeated spaces are collapsed into one space.
+
+    Parameters
+    ----------
+    text : str
+        English or Thai text.
+
+    Returns
+    -------
+    str
+        Normalized text.
+    """
+
+    return " ".join(tokenize(text.translate(_NORMALIZE)))
+
+
+def ngrams(text: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """Character n-grams of the normalized text, padded with a space on both sides.
+
+    Parameters
+    ----------
+    text : str
+        English or Thai text.
+    n : int
+        Length of the n-grams, by default :attr:`NGRAM_SIZE`
+
+    Returns
+    -------
+    Set[str]
+        Distinct n-grams of the text, empty if the text has no word.
+    """
+
+    text = normalize(text)
+
+    if not text:
+        return set()
+
+    text = f" {text} "
+
+    return {text[index : index + n] for index in range(max(len(text) - n + 1, 1))}
+
+
+class _TrieNode(object):
+    __slots__ = ("children", "codes")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        #: Codes of every subject under the node.
+        self.codes: Set[str] = set()
+
+
+class SubjectCatalog(object):
+    """Local index of subjects for offline search.
+
+    Subjects are indexed by code in a prefix trie, by English and Thai name tokens in an inverted index,
+    and by character n-grams of the normalized names for :meth:`search_fuzzy`.
+    The catalog grows incrementally from :meth:`pymyku.Client.search_subject` and
+    :meth:`pymyku.Client.search_subject_open` results, see :meth:`add` and :meth:`add_sections`.
+    Passed to :class:`pymyku.Client`, it is fed by every search of the client.
+
+    Parameters
+    ----------
+    subjects : Optional[Iterable[dict]]
+        Subject dicts to add, by default none.
+    """
+
+    def __init__(self, subjects: Optional[Iterable[dict]] = None) -> None:
+        self.__subjects: Dict[str, dict] = {}
+        self.__trie = _TrieNode()
+        self.__tokens: Dict[str, Set[str]] = {}
+        self.__vocabulary: List[str] = []
+        self.__offerings: Dict[str, Set[Tuple[str, str, str]]] = {}
+        #: Fuzzy index documents, one per (code, name key), by integer id.
+        self.__documents: Dict[Tuple[str, str], int] = {}
+        self.__document_codes: Dict[int, str] = {}
+        self.__next_document: int = 0
+        self.__grams: Dict[int, Set[str]] = {}
+        self.__postings: Dict[str, Set[int]] = {}
+        self.__lock = threading.RLock()
+
+        for subject in subjects or ():
+            self.add(subject)
+
+    def __len__(self) -> int:
+        return len(self.__subjects)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.__subjects
+
+    def __iter__(self) -> Iterator[dict]:
+        with self.__lock:
+            return iter(list(self.__subjects.values()))
+
+    def get(self, code: str) -> Optional[dict]:
+        """Get a subject by code.
+
+        Parameters
+        ----------
+        code : str
+            Subject code, e.g. '01355119-64'
+
+        Returns
+        -------
+        Optional[dict]
+            The subject dict, None if the subject is not in the catalog.
+        """
+        return self.__subjects.get(code)
+
+    def add(
+        self,
+        subject: dict,
+        campus_code: Optional[str] = None,
+        academic_year: Optional[str] = None,
+        semester: Optional[str] = None,
+    ) -> None:
+        """Insert or update a subject.
+
+        Parameters
+        ----------
+        subject : dict
+            Subject dict with at least a subjectCode, as returned by :meth:`pymyku.Client.search_subject`
+        campus_code : Optional[str]
+            Campus the subject is open on, one of :attr:`pymyku.constant.CAMPUS_CODES`
+        academic_year : Optional[str]
+            Academic year the subject is open in.
+        semester : Optional[str]
+            Semester the subject is open in.
+
+        Raises
+        ------
+        ValueError
+            The subject has no subjectCode.
+        """
+
+        code = subject.get("subjectCode")
+
+        if not code:
+            raise ValueError("subject has no subjectCode")
+
+        with self.__lock:
+            old = self.__subjects.get(code)
+            new = dict(old or {})
+            new.update(
+                (key, subject[key])
+                for key in SUBJECT_FIELDS
+                if subject.get(key) is not None
+            )
+            self.__subjects[code] = new
+
+            if old is None:
+                self.__index_code(code)
+
+            old_tokens = self.__name_tokens(old) if old is not None else set()
+            new_tokens = self.__name_tokens(new)
+
+            for token in old_tokens - new_tokens:
+                self.__unindex_token(token, code)
+
+            for token in new_tokens - old_tokens:
+                self.__index_token(token, code)
+
+            for key in ("subjectNameEn", "subjectNameTh"):
+                if old is None or old.get(key) != new.get(key):
+                    self.__index_grams((code, key), str(new.get(key) or ""))
+
+            if campus_code or academic_year or semester:
+                self.__offerings.setdefault(code, set()).add(
+                    (
+                        str(academic_year or ""),
+                        str(semester or ""),
+                        str(campus_code or ""),
+                    )
+                )
+
+    def add_sections(
+        self,
+        sections: Iterable[dict],
+        campus_code: Optional[str] = None,
+        academic_year: Optional[str] = None,
+        semester: Optional[str] = None,
+    ) -> None:
+        """Insert or update the subjects of open sections.
+
+        Parameters
+        ----------
+        sections : Iterable[dict]
+            Section dicts returned by :meth:`pymyku.Client.search_subject_open`
+        campus_code : Optional[str]
+            Campus the sections are open on.
+        academic_year : Optional[str]
+            Academic year the sections are open in.
+        semester : Optional[str]
+            Semester the sections are open in.
+        """
+
+        for section in sections:
+            if section.get("subjectCode"):
+                self.add(section, campus_code, academic_year, semester)
+
+    def remove(self, code: str) -> bool:
+        """Remove a subject.
+
+        Parameters
+        ----------
+        code : str
+            Subject code.
+
+        Returns
+        -------
+        bool
+            False if the subject is not in the catalog.
+        """
+
+        with self.__lock:
+            subject = self.__subjects.pop(code, None)
+
+            if subject is None:
+                return False
+
+            for token in self.__name_tokens(subject):
+                self.__unindex_token(token, code)
+
+            for key in ("subjectNameEn", "subjectNameTh"):
+                self.__index_grams((code, key), "")
+
+            node = self.__trie
+            node.codes.discard(code)
+
+            for char in code.lower():
+                child = node.children[char]
+                child.codes.discard(code)
+
+                if not child.codes:
+                    del node.children[char]
+                    break
+
+                node = child
+
+            self.__offerings.pop(code, None)
+
+            return True
+
+    def search_code(self, prefix: str) -> List[dict]:
+        """Find the subjects whose code starts with a prefix.
+
+        Parameters
+        ----------
+        prefix : str
+            Code prefix, e.g. '01355'
+
+        Returns
+        -------
+        List[dict]
+            Subject dicts sorted by code.
+        """
+
+        with self.__lock:
+            return self.__sorted(self.__codes_with_prefix(prefix))
+
+    def search_name(self, query: str) -> List[dict]:
+        """Find the subjects whose English or Thai name has every token of a query.
+
+        The last token of the query also matches longer tokens, e.g. 'foundation eng'.
+
+        Parameters
+        ----------
+        query : str
+            Words of the name, e.g. 'english foundation'
+
+        Returns
+        -------
+        List[dict]
+            Subject dicts sorted by code.
+        """
+
+        with self.__lock:
+            return self.__sorted(self.__codes_with_name(query))
+
+    def search_fuzzy(
+        self, query: str, k: int = 10, min_score: float = 0.3
+    ) -> List[SubjectMatch]:
+        """Find the subjects whose English or Thai name is similar to a possibly misspelled query.
+
+        Names and query are compared by the Dice coefficient of their character n-grams
+        after :func:`normalize`, so Thai typed without tone marks still matches.
+        The candidates are the names sharing one of the rarest n-grams of the query,
+        without the n-grams of more than :attr:`FUZZY_COMMON_NGRAM` names,
+        and at most :attr:`FUZZY_CANDIDATES` of them are compared, those sharing the most first.
+        So in a large catalog, a weak match sharing only common words with the query may be left out.
+
+        Parameters
+        ----------
+        query : str
+            Approximate name, e.g. 'fundation englsh' or 'ภาษาองกฤษ'
+        k : int
+            Maximum number of subjects, by default 10
+        min_score : float
+            Minimum similarity between 0 and 1, by default 0.3
+
+        Returns
+        -------
+        List[SubjectMatch]
+            Best matching subjects with their similarity, most similar first.
+        """
+
+        grams = ngrams(query)
+
+        if not grams or k < 1:
+            return []
+
+        size = len(grams)
+
+        with self.__lock:
+            postings = self.__postings
+            grams_of = self.__grams
+            codes = self.__document_codes
+            # Rarest n-grams first, so the candidates come from the shortest posting lists.
+            ranked = sorted(grams, key=lambda gram: len(postings.get(gram, ())))
+            # A name scoring at least `min_score` shares at least `overlap` n-grams with the query,
+            # so it has one of the `size - overlap + 1` rarest ones, unless they are too common.
+            overlap = max(int(min_score * size / (2 - min_score)), 1)
+            counts = Counter()
+            counted = 0
+
+            for gram in ranked[: size - overlap + 1]:
+                documents = postings.get(gram, ())
+
+                if counted and len(documents) > FUZZY_COMMON_NGRAM:
+                    break
+
+                counts.update(documents)
+                counted += 1
+
+            candidates = sorted(counts.items(), key=itemgetter(1), reverse=True)
+            compared = 0
+            scores = {}
+            threshold = min_score
+
+            for document, count in candidates:
+                # Most n-grams the name can share with the query.
+                shared = count + size - counted
+
+                if 2 * shared < threshold * (size + shared):
+                    break
+
+                names = grams_of[document]
+                length = len(names)
+
+                if 2 * min(shared, length) < threshold * (size + length):
+                    continue
+
+                score = 2 * len(grams & names) / (size + length)
+                code = codes[document]
+
+                if score >= threshold and score > scores.get(code, 0):
+                    scores[code] = score
+
+                    if len(scores) >= k:
+                        threshold = heapq.nlargest(k, scores.values())[-1]
+
+                compared += 1
+
+                if compared >= FUZZY_CANDIDATES:
+                    break
+
+            best = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+
+            return [SubjectMatch(self.__subjects[code], score) for code, score in best]
+
+    def find(
+        self,
+        code: Optional[str] = None,
+        name: Optional[str] = None,
+        campus_code: Optional[str] = None,
+        academic_year: Optional[str] = None,
+        semester: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """Find the subjects matching every given criterion.
+
+        Parameters
+        ----------
+        code : Optional[str]
+            Code prefix, see :meth:`search_code`
+        name : Optional[str]
+            Name query, see :meth:`search_name`
+        campus_code : Optional[str]
+            Only the subjects open on this campus.
+        academic_year : Optional[str]
+            Only the subjects open in this academic year.
+        semester : Optional[str]
+            Only the subjects open in this semester.
+        limit : Optional[int]
+            Maximum number of subjects, by default all of them.
+
+        Returns
+        -------
+        List[dict]
+            Subject dicts sorted by code.
+        """
+
+        with self.__lock:
+            codes = None
+
+            if code is not None:
+                codes = self.__codes_with_prefix(code)
+
+            if name is not None:
+                named = self.__codes_with_name(name)
+                codes = named if codes is None else codes & named
+
+            if codes is None:
+                codes = set(self.__subjects)
+
+            if campus_code or academic_year or semester:
+                codes = {
+                    code
+                    for code in codes
+                    if any(
+                        (not academic_year or offering[0] == str(academic_year))
+                        and (not semester or offering[1] == str(semester))
+                        and (not campus_code or offering[2] == campus_code)
+                        for offering in self.__offerings.get(code, ())
+                    )
+                }
+
+            return self.__sorted(codes)[:limit]
+
+    def __sorted(self, codes: Iterable[str]) -> List[dict]:
+        return [self.__subjects[code] for code in sorted(codes)]
+
+    def __codes_with_prefix(self, prefix: str) -> Set[str]:
+        node = self.__trie
+
+        for char in prefix.strip().lower():
+            node = node.children.get(char)
+
+            if node is None:
+                return set()
+
+        return set(node.codes)
+
+    def __codes_with_name(self, query: str) -> Set[str]:
+        tokens = tokenize(query)
+
+        if not tokens:
+            return set()
+
+        codes = None
+
+        for index, token in enumerate(tokens):
+            if index == len(tokens) - 1:
+                matched = set()
+                start = bisect_left(self.__vocabulary, token)
+
+                for word in self.__vocabulary[start:]:
+                    if not word.startswith(token):
+                        break
+                    matched |= self.__tokens[word]
+            else:
+                matched = self.__tokens.get(token, set())
+
+            codes = matched if codes is None else codes & matched
+
+            if not codes:
+                return set()
+
+        return set(codes)
+
+    @staticmethod
+    def __name_tokens(subject: dict) -> Set[str]:
+        return {
+            token
+            for key in ("subjectNameEn", "subjectNameTh")
+            for token in tokenize(str(subject.get(key) or ""))
+        }
+
+    def __index_code(self, code: str) -> None:
+        node = self.__trie
+        node.codes.add(code)
+
+        for char in code.lower():
+            node = node.children.setdefault(char, _TrieNode())
+            node.codes.add(code)
+
+    def __index_grams(self, document: Tuple[str, str], name: str) -> None:
+        """Replace the n-grams of a name in the fuzzy index."""
+
+        identifier = self.__documents.pop(document, None)
+
+        if identifier is not None:
+            del self.__document_codes[identifier]
+
+            for gram in self.__grams.pop(identifier):
+                identifiers = self.__postings[gram]
+                identifiers.discard(identifier)
+
+                if not identifiers:
+                    del self.__postings[gram]
+
+        grams = ngrams(name)
+
+        if not grams:
+            return
+
+        identifier = self.__documents[document] = self.__next_document
+        self.__next_document += 1
+        self.__document_codes[identifier] = document[0]
+        self.__grams[identifier] = grams
+
+        for gram in grams:
+            self.__postings.setdefault(gram, set()).add(identifier)
+
+    def __index_token(self, token: str, code: str) -> None:
+        codes = self.__tokens.get(token)
+
+        if codes is None:
+            codes = self.__tokens[token] = set()
+            insort(self.__vocabulary, token)
+
+        codes.add(code)
+
+    def __unindex_token(self, token: str, code: str) -> None:
+        codes = self.__tokens.get(token)
+
+        if codes is None:
+            return
+
+        codes.discard(code)
+
+        if not codes:
+            del self.__tokens[token]
+            del self.__vocabulary[bisect_left(self.__vocabulary, token)]
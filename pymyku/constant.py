@@ -26,4 +26,27 @@ STUDENT_PARAM_RES_NAMES = (
 #: Dictionary to convert snake case student param to actual name.
 STUDENT_PARAM_DICT = dict(zip(STUDENT_PARAM_NAMES, STUDENT_PARAM_RES_NAMES))
 
+#: Campus codes, 'B' for Bang Khen, 'C' for Sakolkorn, 'I' for affiliated institute,
+#: 'K' for Kamphaeng Saen, 'P' for Suphanburi.
+CAMPUS_CODES = ("B", "C", "I", "K", "P")
+
+#: Endpoints fetched by :meth:`pymyku.Client.fetch_all`, named after the `fetch_*` method of the client.
+FETCH_ALL_ENDPOINTS = (
+    "grades",
+    "gpax",
+    "student_personal",
+    "student_education",
+    "student_address",
+    "group_course",
+    "announce",
+    "enroll",
+)
+
+#: Semesters in the order they happen within an academic year,
+#: '1' for the first semester, '2' for the second semester, '0' for the summer semester.
+SEMESTER_ORDER = ("1", "2", "0")
+
+#: Default (connect, read) timeouts in seconds of every request.
+TIMEOUT = (5, 30)
+
 PUBLIC_KEY = "-----BEGIN PUBLIC KEY-----\nMIICIjANBgkqhkiG9w0BAQEFAAOCAg8AMIICCgKCAgEAytOhlq/JPcTN0fX+VqObE5kwIaDnEtso2KGHdi9y7uTtQA6pO4fsPNJqtXOdrcfDgp/EQifPwVRZpjdbVrD6FgayrQQILAnARKzVmzwSMDdaP/hOB6i9ouKsIhN9hQUmUhbhaMkh7UXoxGW+gCSK8dq0+FJVnlt1dtJByiVAJRi2oKSdLRqNjk8yGzuZ6SrEFzAgYZwmQiywUF6V1ZaMUQDz8+nr9OOVU3c6Z2IQXCbOv6S7TAg0VhriFL18ZxUPS6759SuKC63VOOSf4EEHy1m0qBgpCzzlsB7D4ssF9x0ZVXLREFrqikP71Hg6tSGcu4YBKL+VwIDWWaXzz6szxeDXdYTA3l35P7I9uBUgMznIjTjNaAX4AXRsJcN9fpF7mVq4eK1CorBY+OOzOc+/yVBpKysdaV/yZ+ABEhX93B2kPLFSOPUKjSPK2rtqE6h2NSl5BFuGEoVBerKn+ymOnmE4/SDBSe5S6gIL5vwy5zNMsxWUaUF5XO9Ez+2v8+yPSvQydj3pw5Rlb07mAXcI18ZYGClO6g/aKL52KYnn1FZ/X3r8r/cibfDbuXC6FRfVXJmzikVUqZdTp0tOwPkh4V0R63l2RO9Luy7vG6rurANSFnUA9n842KkRtBagQeQC96dbC0ebhTj+NPmskklxr6/6Op/P7d+YY76WzvQMvnsCAwEAAQ==\n-----END PUBLIC KEY-----"
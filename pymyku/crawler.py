@@ -0,0 +1,274 @@
+import json
+import os
+import sqlite3
+import threading
+
+from . import bulk
+from .catalog import SubjectCatalog
+from .type import ClientType, CrawlResult, Iterable, List, Optional, Set
+
+#: Every 3 digit prefix of the subject codes, '000' to '999'.
+SUBJECT_PREFIXES = tuple(f"{number:03d}" for number in range(1000))
+
+
+class JSONLSink(object):
+    """Append the crawled subjects to a JSON lines file, one subject dict per line.
+
+    Subjects already in the file are skipped, so resuming a crawl does not duplicate lines.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, created if it does not exist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.__codes: Set[str] = set()
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        self.__codes.add(json.loads(line)["subjectCode"])
+                    except (ValueError, KeyError, TypeError):
+                        # A line cut by a crash.
+                        continue
+
+        self.__file = open(path, "a", encoding="utf-8")
+
+    def write(self, subject: dict) -> None:
+        """Append a subject.
+
+        Parameters
+        ----------
+        subject : dict
+            Subject dict returned by :meth:`pymyku.Client.search_subject`
+        """
+
+        code = subject.get("subjectCode")
+
+        if code in self.__codes:
+            return
+
+        self.__codes.add(code)
+        self.__file.write(json.dumps(subject, ensure_ascii=False) + "\n")
+        self.__file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self.__file.close()
+
+
+class SQLiteSink(object):
+    """Store the crawled subjects in a SQLite table `subjects` keyed by subject code.
+
+    Parameters
+    ----------
+    path : str
+        Path of the database file, created if it does not exist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.__connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS subjects (code TEXT PRIMARY KEY, subject TEXT NOT NULL)"
+        )
+        self.__lock = threading.Lock()
+
+    def write(self, subject: dict) -> None:
+        """Insert or update a subject.
+
+        Parameters
+        ----------
+        subject : dict
+            Subject dict returned by :meth:`pymyku.Client.search_subject`
+        """
+
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO subjects (code, subject) VALUES (?, ?)",
+                (subject.get("subjectCode"), json.dumps(subject, ensure_ascii=False)),
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        self.__connection.close()
+
+
+class CatalogSink(object):
+    """Add the crawled subjects to a :class:`pymyku.catalog.SubjectCatalog`.
+
+    The catalog lives in memory, so a resumed crawl only adds the subjects it finds itself.
+
+    Parameters
+    ----------
+    catalog : SubjectCatalog
+        The catalog to add to.
+    """
+
+    def __init__(self, catalog: SubjectCatalog) -> None:
+        self.catalog: SubjectCatalog = catalog
+
+    def write(self, subject: dict) -> None:
+        """Add a subject.
+
+        Parameters
+        ----------
+        subject : dict
+            Subject dict returned by :meth:`pymyku.Client.search_subject`
+        """
+        self.catalog.add(subject)
+
+    def close(self) -> None:
+        pass
+
+
+class Crawler(object):
+    """Crawl the subject catalog with :meth:`pymyku.Client.search_subject` over many prefixes.
+
+    The prefixes are queried concurrently under a rate limit, subjects are deduplicated by code
+    and written to the sinks as soon as they are found.
+    With a `checkpoint` file, the done prefixes and found subject codes are saved regularly,
+    and a crawl restarted with the same file skips them. Failed prefixes are retried on restart.
+
+    Parameters
+    ----------
+    client : ClientType
+        Initialized client to search with.
+    sinks : Iterable
+        Objects with a `write(subject)` and a `close()` method,
+        e.g. :class:`JSONLSink`, :class:`SQLiteSink` or :class:`CatalogSink`
+    checkpoint : Optional[str]
+        Path of the JSON checkpoint file, by default no checkpoint.
+    prefixes : Optional[Iterable[str]]
+        Queries to crawl, by default :attr:`SUBJECT_PREFIXES`
+    max_workers : int
+        Maximum number of concurrent requests, by default 8
+    rate : Optional[float]
+        Maximum number of requests started per second, by default 5
+    checkpoint_every : int
+        Number of done prefixes between two checkpoints, by default 20
+    """
+
+    def __init__(
+        self,
+        client: ClientType,
+        sinks: Iterable = (),
+        checkpoint: Optional[str] = None,
+        prefixes: Optional[Iterable[str]] = None,
+        max_workers: int = 8,
+        rate: Optional[float] = 5,
+        checkpoint_every: int = 20,
+    ) -> None:
+        self.__client: ClientType = client
+        self.__sinks: List = list(sinks)
+        self.__checkpoint: Optional[str] = checkpoint
+        self.__prefixes: List[str] = list(
+            SUBJECT_PREFIXES if prefixes is None else prefixes
+        )
+        self.__max_workers: int = max_workers
+        self.__rate: Optional[float] = rate
+        self.__checkpoint_every: int = checkpoint_every
+        self.__done: Set[str] = set()
+        self.__codes: Set[str] = set()
+
+        self.__load()
+
+    def __enter__(self) -> "Crawler":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def done(self) -> Set[str]:
+        """Prefixes crawled successfully, including by a previous run."""
+        return set(self.__done)
+
+    @property
+    def codes(self) -> Set[str]:
+        """Codes of the subjects found, including by a previous run."""
+        return set(self.__codes)
+
+    def run(self) -> CrawlResult:
+        """Crawl the prefixes that are not done yet.
+
+        Returns
+        -------
+        CrawlResult
+            Number of new subjects and crawled prefixes, and the prefixes that failed.
+        """
+
+        pending = [prefix for prefix in self.__prefixes if prefix not in self.__done]
+        subjects = 0
+        prefixes = 0
+        errors = {}
+
+        try:
+            for result in bulk.run(
+                self.__client.search_subject,
+                pending,
+                self.__max_workers,
+                self.__rate,
+            ):
+                if not result.ok:
+                    errors[result.key] = result.error
+                    continue
+
+                for subject in result.result:
+                    code = subject.get("subjectCode")
+
+                    if not code or code in self.__codes:
+                        continue
+
+                    self.__codes.add(code)
+                    subjects += 1
+
+                    for sink in self.__sinks:
+                        sink.write(subject)
+
+                self.__done.add(result.key)
+                prefixes += 1
+
+                if prefixes % self.__checkpoint_every == 0:
+                    self.save()
+        finally:
+            self.save()
+
+        return CrawlResult(subjects, prefixes, errors)
+
+    def close(self) -> None:
+        """Close the sinks."""
+
+        for sink in self.__sinks:
+            sink.close()
+
+    def save(self) -> None:
+        """Write the checkpoint file, atomically so that a crash never leaves it half written."""
+
+        if self.__checkpoint is None:
+            return
+
+        temporary = self.__checkpoint + ".tmp"
+
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(
+                {"done": sorted(self.__done), "codes": sorted(self.__codes)}, file
+            )
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary, self.__checkpoint)
+
+    def __load(self) -> None:
+        if self.__checkpoint is None or not os.path.exists(self.__checkpoint):
+            return
+
+        with open(self.__checkpoint, encoding="utf-8") as file:
+            state = json.load(file)
+
+        self.__done = set(state.get("done", ()))
+        self.__codes = set(state.get("codes", ()))
@@ -0,0 +1,167 @@
+import threading
+import time
+
+from .exception import DeadlineExceeded
+from .type import Any, Callable, List, Optional, Tuple, Union
+
+#: Timeout of a request, seconds or (connect, read) seconds, None to wait forever.
+TimeoutType = Optional[Union[float, Tuple[Optional[float], Optional[float]]]]
+
+_local = threading.local()
+
+
+def _stack() -> List["Deadline"]:
+    stack = getattr(_local, "stack", None)
+
+    if stack is None:
+        stack = _local.stack = []
+
+    return stack
+
+
+def current() -> Optional["Deadline"]:
+    """The deadline of the current thread.
+
+    Returns
+    -------
+    Optional[Deadline]
+        The earliest deadline entered by the thread, None outside of any deadline.
+    """
+
+    stack = _stack()
+
+    return stack[-1] if stack else None
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline of the current thread.
+
+    Returns
+    -------
+    Optional[float]
+        Seconds left, 0 when the deadline has passed, None outside of any deadline.
+    """
+
+    deadline = current()
+
+    return None if deadline is None else deadline.remaining()
+
+
+def check() -> None:
+    """Raise if the deadline of the current thread has passed.
+
+    Raises
+    ------
+    exception.DeadlineExceeded
+        The deadline has passed.
+    """
+
+    deadline = current()
+
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceeded(f"The deadline of {deadline.seconds}s is exceeded.")
+
+
+def timeout(value: TimeoutType) -> TimeoutType:
+    """Cap the timeout of a request to the time left before the deadline of the current thread.
+
+    Parameters
+    ----------
+    value : TimeoutType
+        Timeout of the request, seconds or (connect, read) seconds, None to wait forever.
+
+    Returns
+    -------
+    TimeoutType
+        The timeout with every part at most the seconds left, unchanged outside of any deadline.
+
+    Raises
+    ------
+    exception.DeadlineExceeded
+        The deadline has passed.
+    """
+
+    check()
+
+    left = remaining()
+
+    if left is None:
+        return value
+
+    def cap(seconds: Optional[float]) -> float:
+        return left if seconds is None else min(seconds, left)
+
+    if isinstance(value, tuple):
+        return tuple(cap(seconds) for seconds in value)
+
+    return cap(value)
+
+
+class Deadline(object):
+    """Total time budget shared by every request sent in its context.
+
+    Inside ``with Deadline(seconds):``, every request sent through :class:`pymyku.Session`
+    has its timeouts capped to the time left, waits for a rate limit, a bulkhead slot or a retry
+    only while time is left, and raises :class:`pymyku.exception.DeadlineExceeded`
+    instead of being sent once the time is spent.
+    So a composite operation such as :meth:`pymyku.Client.initialize` or
+    :meth:`pymyku.Client.get_enrollment_history` finishes or fails within `seconds`.
+
+    The deadline follows the calls of :func:`pymyku.bulk.run` and :meth:`pymyku.Client.fetch_all`
+    to their worker threads, calls not started in time fail without sending anything.
+    A nested deadline can shorten the budget but never extend it.
+
+    Parameters
+    ----------
+    seconds : float
+        Time budget in seconds, starting now.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.__seconds: float = seconds
+        self.__expires: float = time.monotonic() + seconds
+
+    @property
+    def seconds(self) -> float:
+        """Time budget in seconds."""
+        return self.__seconds
+
+    @property
+    def expires(self) -> float:
+        """Time of the deadline, in :func:`time.monotonic` seconds."""
+        return self.__expires
+
+    @property
+    def expired(self) -> bool:
+        """True if the deadline has passed."""
+        return time.monotonic() >= self.__expires
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, 0 when it has passed."""
+        return max(self.__expires - time.monotonic(), 0.0)
+
+    def __enter__(self) -> "Deadline":
+        stack = _stack()
+        outer = stack[-1] if stack else None
+
+        # The earliest deadline wins, so a nested one never extends the budget.
+        stack.append(self if outer is None or self.__expires < outer.expires else outer)
+
+        return self
+
+    def __exit__(self, *args) -> None:
+        _stack().pop()
+
+    def wrap(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        """Return `function` running under this deadline, in whatever thread it is called.
+
+        The returned function raises :class:`pymyku.exception.DeadlineExceeded`
+        without calling `function` once the deadline has passed.
+        """
+
+        def bounded(*args, **kwargs):
+            with self:
+                check()
+                return function(*args, **kwargs)
+
+        return bounded
@@ -1,5 +1,17 @@
-from requests import HTTPError
+from requests import HTTPError, RequestException, Timeout
 
 class TokenExpired(HTTPError):
     '''The access token has expired.'''
     pass
+
+class CircuitOpen(RequestException):
+    '''The circuit breaker of the API is open, the request was not sent.'''
+    pass
+
+class BulkheadFull(RequestException):
+    '''Too many requests to the API are in flight, the request was not sent.'''
+    pass
+
+class DeadlineExceeded(Timeout):
+    '''The time budget of the operation is spent, the request was not sent or was cut short.'''
+    pass
@@ -0,0 +1,279 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from . import deadline
+from .type import Callable, Dict, Iterable, Optional, Response
+
+
+class _Latency(object):
+    __slots__ = ("samples", "requests", "hedged", "wins", "denied")
+
+    def __init__(self, size: int) -> None:
+        #: Seconds taken by the recent successful requests.
+        self.samples: deque = deque(maxlen=size)
+        self.requests: int = 0
+        self.hedged: int = 0
+        self.wins: int = 0
+        self.denied: int = 0
+
+
+class HedgePolicy(object):
+    """Hedge slow GET requests: send a second identical request and use whichever answers first.
+
+    When a GET request to one of `apis` has not answered after the `percentile` of the recent
+    latency of its API, a hedge is sent and the first successful response wins.
+    The other one is left to finish in the background and its response is closed.
+    A request is only hedged once `min_samples` latencies of its API are known.
+
+    A hedge budget caps the extra load: every request earns `budget` hedge,
+    up to `budget` times 100 saved, and every hedge spends one.
+
+    Pass the policy to :class:`pymyku.Session` to hedge the requests sent through the session.
+    Every copy of a request waits for its own rate limit slot and goes through the circuit breaker.
+
+    Parameters
+    ----------
+    apis : Optional[Iterable[str]]
+        APIs (:mod:`pymyku.url`) whose GET requests are hedged, by default every API
+    percentile : float
+        Percentile of the recent latency after which a hedge is sent, by default 0.95
+    budget : float
+        Hedges earned by every request, i.e. the maximum extra load, by default 0.05
+    min_delay : float
+        Minimum seconds to wait before a hedge, by default 0.05
+    samples : int
+        Number of recent latencies kept per API, by default 100
+    min_samples : int
+        Number of latencies of an API needed before its requests are hedged, by default 20
+    max_workers : int
+        Maximum number of requests in flight through the policy,
+        the requests over it are sent without hedging, by default 16
+    """
+
+    def __init__(
+        self,
+        apis: Optional[Iterable[str]] = None,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        min_delay: float = 0.05,
+        samples: int = 100,
+        min_samples: int = 20,
+        max_workers: int = 16,
+    ) -> None:
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be in (0, 1]")
+
+        if min_samples > samples:
+            raise ValueError("min_samples must be at most samples")
+
+        self.__apis: Optional[frozenset] = None if apis is None else frozenset(apis)
+        self.__percentile: float = percentile
+        self.__budget_ratio: float = budget
+        self.__min_delay: float = min_delay
+        self.__samples: int = samples
+        self.__min_samples: int = min_samples
+        self.__max_workers: int = max_workers
+        self.__budget: float = 0.0
+        self.__in_flight: int = 0
+        self.__lock = threading.Lock()
+        self.__latencies: Dict[str, _Latency] = {}
+        # Room for a primary and a hedge of every request.
+        self.__executor = ThreadPoolExecutor(max_workers=2 * max_workers)
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hedging of every API.
+
+        Returns
+        -------
+        Dict[str, Dict[str, float]]
+            For every API, the number of hedgeable `requests`, of `hedged` requests,
+            of `wins` where the hedge answered first and of hedges `denied` by the budget,
+            the `win_rate` of the hedges and the current hedge `delay` in seconds, None until known.
+        """
+        with self.__lock:
+            return {
+                api: {
+                    "requests": latency.requests,
+                    "hedged": latency.hedged,
+                    "wins": latency.wins,
+                    "denied": latency.denied,
+                    "win_rate": (
+                        latency.wins / latency.hedged if latency.hedged else 0.0
+                    ),
+                    "delay": self.__delay(latency),
+                }
+                for api, latency in self.__latencies.items()
+            }
+
+    def hedgeable(self, method: str, api: str) -> bool:
+        """Check if the requests of a method to an API can be hedged.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+        api : str
+            API of the request, one of :mod:`pymyku.url`
+
+        Returns
+        -------
+        bool
+            True for GET requests to `apis`.
+        """
+
+        return method.upper() == "GET" and (self.__apis is None or api in self.__apis)
+
+    def delay(self, api: str) -> Optional[float]:
+        """Seconds to wait for a request to an API before hedging it.
+
+        Parameters
+        ----------
+        api : str
+            API of the request, one of :mod:`pymyku.url`
+
+        Returns
+        -------
+        Optional[float]
+            The `percentile` of the recent latency, at least `min_delay`,
+            None while fewer than `min_samples` latencies are known.
+        """
+
+        with self.__lock:
+            latency = self.__latencies.get(api)
+
+            return None if latency is None else self.__delay(latency)
+
+    def __delay(self, latency: _Latency) -> Optional[float]:
+        if len(latency.samples) < self.__min_samples:
+            return None
+
+        samples = sorted(latency.samples)
+        index = min(math.ceil(self.__percentile * len(samples)) - 1, len(samples) - 1)
+
+        return max(samples[index], self.__min_delay)
+
+    def call(self, method: str, api: str, send: Callable[[], Response]) -> Response:
+        """Send a request and hedge it if it is slow.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+        api : str
+            API of the request, one of :mod:`pymyku.url`
+        send : Callable[[], Response]
+            Function sending the request once, called from worker threads.
+
+        Returns
+        -------
+        Response
+            The first response, an error status included, of the copy that answered first.
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            Every copy of the request failed, the error of the first one is raised.
+        """
+
+        if not self.hedgeable(method, api):
+            return send()
+
+        with self.__lock:
+            latency = self.__latencies.get(api)
+
+            if latency is None:
+                latency = self.__latencies[api] = _Latency(self.__samples)
+
+            latency.requests += 1
+            self.__budget = min(
+                self.__budget + self.__budget_ratio, self.__budget_ratio * 100
+            )
+            delay = self.__delay(latency)
+
+            if delay is not None and self.__in_flight >= self.__max_workers:
+                # Every worker is busy, a queued request would only be slower.
+                delay = None
+            elif delay is not None:
+                self.__in_flight += 1
+
+        if delay is None:
+            return self.__timed(latency, send)
+
+        bound = deadline.current()
+
+        if bound is not None:
+            send = bound.wrap(send)
+
+        try:
+            primary = self.__submit(latency, send)
+            done, _ = wait([primary], timeout=delay)
+
+            if done or not self.__spend(latency):
+                return primary.result()
+
+            hedge = self.__submit(latency, send)
+            winner = self.__first(primary, hedge)
+
+            if winner is hedge:
+                with self.__lock:
+                    latency.wins += 1
+
+            loser = primary if winner is hedge else hedge
+            loser.add_done_callback(self.__close)
+
+            return winner.result()
+        finally:
+            with self.__lock:
+                self.__in_flight -= 1
+
+    def __timed(self, latency: _Latency, send: Callable[[], Response]) -> Response:
+        start = time.monotonic()
+        response = send()
+
+        if response.ok:
+            with self.__lock:
+                latency.samples.append(time.monotonic() - start)
+
+        return response
+
+    def __submit(self, latency: _Latency, send: Callable[[], Response]) -> Future:
+        return self.__executor.submit(self.__timed, latency, send)
+
+    def __spend(self, latency: _Latency) -> bool:
+        with self.__lock:
+            if self.__budget < 1:
+                latency.denied += 1
+                return False
+
+            self.__budget -= 1
+            latency.hedged += 1
+            return True
+
+    @staticmethod
+    def __first(primary: Future, hedge: Future) -> Future:
+        """The first of both futures to succeed, or `primary` if both fail."""
+
+        pending = {primary, hedge}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in (primary, hedge):
+                if future in done and future.exception() is None:
+                    return future
+
+        return primary
+
+    @staticmethod
+    def __close(future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def close(self) -> None:
+        """Stop the worker threads, the requests in flight finish in the background."""
+
+        self.__executor.shutdown(wait=False)
@@ -1,22 +1,143 @@
-from . import attribute, exception, requests, utils
-from .type import Any, ClientType, Dict, Enum, List, Optional, Response, Union
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import attribute, bulk, constant, deadline, exception, requests, utils
+from .cache import PrefixCache, ResponseCache
+from .catalog import SubjectCatalog
+from .session import Session
+from .type import (
+    Any,
+    BulkResult,
+    ClientType,
+    Dict,
+    EnrollmentHistory,
+    Enum,
+    FetchAllResult,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Response,
+    SemesterEnrollment,
+    SweepResult,
+    Tuple,
+    Union,
+)
 
 
 class Client(ClientType):
     """Represents a client connection that connects to MyKU. This class is used to interact with the MyKU API.
     The client is initialized with a username and password and will login to MyKU automatically.
+
+    Every request of the client is sent through one pooled keep-alive :class:`pymyku.Session`.
+    The client can be used as a context manager, :meth:`close` is called on exit.
+
+    A client can be shared by many threads. When the access token expires,
+    only one of them refreshes it while the others wait and retry with the new token.
+
+    Parameters
+    ----------
+    username : str
+        Your Nontri account username (b##########)
+    password : str
+        Your password (Don't worry, your password is not saved)
+    session : Optional[Session]
+        Session to send the requests with. If not provided, the client creates and owns one.
+    auto_refresh : bool
+        Refresh the access token in the background before it expires, by default False.
+        Only possible when the access token is a JWT with an 'exp' claim.
+    refresh_margin : float
+        Seconds before the expiry of the access token to refresh it, by default 60
+    refresh_jitter : float
+        Up to this many seconds are randomly added to `refresh_margin`,
+        so that many clients do not refresh at the same moment, by default 30
+    cache : Optional[ResponseCache]
+        Cache to answer the requests of the client from, by default no cache.
+    subject_cache : Optional[PrefixCache]
+        Cache answering :meth:`search_subject` queries from the results of their prefixes, by default no cache.
+    catalog : Optional[SubjectCatalog]
+        Catalog to add the subjects found by :meth:`search_subject` and :meth:`search_subject_open` to,
+        by default none.
     """
 
-    def __init__(self, username: str, password: str) -> None:
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        session: Optional[Session] = None,
+        auto_refresh: bool = False,
+        refresh_margin: float = 60,
+        refresh_jitter: float = 30,
+        cache: Optional[ResponseCache] = None,
+        subject_cache: Optional[PrefixCache] = None,
+        catalog: Optional[SubjectCatalog] = None,
+    ) -> None:
         self.__username: str = username
         self.__password: str = password
+        self.__owns_session: bool = session is None
+        self.__session: Session = session if session is not None else Session()
+        self.__auto_refresh: bool = auto_refresh
+        self.__refresh_margin: float = refresh_margin
+        self.__refresh_jitter: float = refresh_jitter
+        self.__refresh_timer: Optional[threading.Timer] = None
+        self.__closed: bool = False
+        self.__cache: Optional[ResponseCache] = cache
+        self.__subject_cache: Optional[PrefixCache] = subject_cache
+        self.__catalog: Optional[SubjectCatalog] = catalog
+        self.__token_lock = threading.Lock()
+        self.__refresh_lock = threading.Lock()
         self.__login_response: dict = {}
         self.__access_token: str = ""
         self.__schedule_response: dict = {}
         self.__academic_year: Optional[str] = None
         self.__semester: Optional[str] = None
 
-        self.initialize()
+        try:
+            self.initialize()
+        except BaseException:
+            # The caller never gets the client, so nobody else can close it.
+            self.close()
+            raise
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def session(self) -> Session:
+        """Session used to send the requests of the client.
+
+        Returns
+        -------
+        Session
+            Pooled keep-alive session. Its :attr:`pymyku.Session.stats` reports connection reuse.
+        """
+        return self.__session
+
+    @property
+    def subject_cache(self) -> Optional[PrefixCache]:
+        """Cache of the :meth:`search_subject` results, None if the client does not cache them."""
+        return self.__subject_cache
+
+    @property
+    def catalog(self) -> Optional[SubjectCatalog]:
+        """Catalog of the subjects found by the client, None if the client does not keep one."""
+        return self.__catalog
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """Cache the requests of the client are answered from.
+
+        Returns
+        -------
+        Optional[ResponseCache]
+            The response cache, None if the client does not cache.
+        """
+        return self.__cache
 
     @property
     def login_response(self) -> dict:
@@ -110,7 +231,11 @@ class Client(ClientType):
         self, response: Response, to_json: bool = True
     ) -> Union[dict, Response]:
         """If the response is not 200, check if the error is due to an expired token.
-        If so, reset the token and raise an error. Otherwise, raise the error
+        If so, raise :exc:`exception.TokenExpired`. Otherwise, raise the error
+
+        Requests sent by the client already refresh an expired token and retry once,
+        so :exc:`exception.TokenExpired` is only raised when that retry expired as well.
+        The client is left as is for the other threads sharing it, the next request refreshes the token again.
 
         Parameters
         ----------
@@ -137,10 +262,7 @@ class Client(ClientType):
         if response.status_code != 200:
 
             if data.get("code") == "expired":
-                self.reset()
-                raise exception.TokenExpired(
-                    "The access token has expired. Please reinitialize the client with .initialize()."
-                )
+                raise exception.TokenExpired("The access token has expired.")
 
         response.raise_for_status()
 
@@ -162,16 +284,36 @@ class Client(ClientType):
             self.__schedule_response
         )
 
+        if self.__cache is not None:
+            self.__cache.current_semester = (self.__academic_year, self.__semester)
+
     def reset(self) -> None:
         """Reset the client attributes.
 
         Affected attributes: :attr:`login_response`, :attr:`.access_token`, :attr:`.schedule_response`, :attr:`.academic_year` and :attr:`.semester`
         """
-        self.__login_response = {}
-        self.__access_token = ""
-        self.__schedule_response = {}
-        self.__academic_year = None
-        self.__semester = None
+        with self.__token_lock:
+            self.__login_response = {}
+            self.__access_token = ""
+            self.__schedule_response = {}
+            self.__academic_year = None
+            self.__semester = None
+
+            self.__cancel_refresh()
+
+    def close(self) -> None:
+        """Stop the background refresh and close the pooled connections of the session
+        if the session is owned by the client.
+
+        A session passed to the client is left open for its owner to close.
+        """
+        with self.__token_lock:
+            # A background refresh in flight must not schedule the next one.
+            self.__closed = True
+            self.__cancel_refresh()
+
+        if self.__owns_session:
+            self.__session.close()
 
     def headers(self) -> dict:
         """Return the headers for the requests.
@@ -194,15 +336,158 @@ class Client(ClientType):
             Response object from the login request. Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
         """
 
-        login_response = requests.login(self.__username, self.__password)
+        login_response = requests.login(
+            self.__username, self.__password, session=self.__session
+        )
 
         login_response.raise_for_status()
 
-        self.__login_response = login_response.json()
-        self.__access_token = self.__login_response["accesstoken"]
+        self.__set_login_response(login_response.json())
 
         return login_response
 
+    def renew(self) -> Response:
+        """Get a new access token with the renew token instead of logging in again.
+
+        API: https://myapi.ku.th/auth/renew
+
+        Affected attributes: :attr:`login_response` and :attr:`.access_token`
+
+        Returns
+        -------
+        Response
+            Response object from the renew request.
+
+        Raises
+        ------
+        ValueError
+            The login response has no renew token.
+        exception.HTTPError
+            The request is not successful.
+        """
+
+        renew_response = requests.renew(client=self)
+
+        renew_response.raise_for_status()
+
+        data = renew_response.json()
+        access_token = utils.extract_access_token(data)
+
+        login_response = dict(self.__login_response)
+        login_response["accesstoken"] = access_token
+        login_response["renewtoken"] = data.get(
+            "renewtoken", login_response.get("renewtoken")
+        )
+
+        self.__set_login_response(login_response)
+
+        return renew_response
+
+    def refresh(self, expired_token: Optional[str] = None) -> None:
+        """Replace an expired access token.
+
+        :meth:`renew` is tried first, :meth:`login` is called only if the renewal fails.
+        Only one thread refreshes at a time, the others wait for it to finish.
+
+        Affected attributes: :attr:`login_response` and :attr:`.access_token`
+
+        Parameters
+        ----------
+        expired_token : Optional[str]
+            The access token found expired. If another thread has already replaced it
+            while waiting, nothing is refreshed. By default the current token is refreshed.
+        """
+
+        with self.__refresh_lock:
+            if expired_token is not None and expired_token != self.__access_token:
+                return
+
+            try:
+                self.renew()
+            except (ValueError, KeyError, exception.RequestException):
+                self.login()
+
+    def __set_login_response(self, login_response: dict) -> None:
+        """Swap the login response and access token at once and schedule the next refresh."""
+
+        access_token = login_response["accesstoken"]
+
+        with self.__token_lock:
+            self.__login_response = login_response
+            self.__access_token = access_token
+
+            self.__schedule_refresh()
+
+    def __schedule_refresh(self) -> None:
+        """Schedule :meth:`refresh` in a background thread shortly before the access token expires.
+
+        Called with the token lock held.
+        """
+
+        self.__cancel_refresh()
+
+        if not self.__auto_refresh or self.__closed:
+            return
+
+        expiry = utils.extract_token_expiry(self.__access_token)
+
+        if expiry is None:
+            return
+
+        remaining = expiry - time.time()
+
+        if remaining <= 0:
+            return
+
+        delay = (
+            remaining - self.__refresh_margin - random.uniform(0, self.__refresh_jitter)
+        )
+
+        # A token that lives shorter than the margin is refreshed halfway instead of in a loop.
+        delay = max(delay, remaining / 2)
+
+        timer = threading.Timer(delay, self.__background_refresh)
+        timer.daemon = True
+        timer.start()
+
+        self.__refresh_timer = timer
+
+    def __cancel_refresh(self) -> None:
+        """Cancel the scheduled background refresh, if any."""
+
+        if self.__refresh_timer is not None:
+            self.__refresh_timer.cancel()
+            self.__refresh_timer = None
+
+    def __background_refresh(self) -> None:
+        """Refresh the access token from the refresh timer."""
+
+        if self.__closed:
+            return
+
+        try:
+            self.refresh()
+        except Exception:
+            # The token is still refreshed on demand by the next request that finds it expired.
+            pass
+
+    def __send(self, function: callable, **kwargs) -> Response:
+        """Send the request of a :mod:`pymyku.requests` function on behalf of the client.
+
+        If the access token has expired, it is refreshed with :meth:`refresh`
+        and the request is sent once more.
+        """
+
+        access_token = self.__access_token
+
+        response = function(client=self, **kwargs)
+
+        if utils.is_token_expired(response):
+            self.refresh(access_token)
+            response = function(client=self, **kwargs)
+
+        return response
+
     def fetch_schedule(
         self, as_response: Optional[bool] = False
     ) -> Union[dict, Response]:
@@ -221,7 +506,7 @@ class Client(ClientType):
             Response from the request. Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
         """
 
-        response = requests.get_schedule(login_response=self.__login_response)
+        response = self.__send(requests.get_schedule)
 
         if as_response:
             return response
@@ -252,11 +537,8 @@ class Client(ClientType):
         if semester is None:
             semester = self.__semester
 
-        response = requests.get_announce(
-            academic_year=academic_year,
-            semester=semester,
-            login_response=self.__login_response,
-            schedule_response=self.__schedule_response,
+        response = self.__send(
+            requests.get_announce, academic_year=academic_year, semester=semester
         )
 
         if as_response:
@@ -282,7 +564,7 @@ class Client(ClientType):
             Response from the request.
         """
 
-        response = requests.get_check_grades(login_response=self.__login_response)
+        response = self.__send(requests.get_check_grades)
 
         if as_response:
             return response
@@ -307,10 +589,7 @@ class Client(ClientType):
             Response from the request.
         """
 
-        response = requests.get_group_course(
-            login_response=self.__login_response,
-            schedule_response=self.__schedule_response,
-        )
+        response = self.__send(requests.get_group_course)
 
         if as_response:
             return response
@@ -335,7 +614,7 @@ class Client(ClientType):
             Response from the request.
         """
 
-        response = requests.get_student_address(login_response=self.__login_response)
+        response = self.__send(requests.get_student_address)
 
         if as_response:
             return response
@@ -360,7 +639,7 @@ class Client(ClientType):
 
         """
 
-        response = requests.get_student_personal(login_response=self.__login_response)
+        response = self.__send(requests.get_student_personal)
 
         if as_response:
             return response
@@ -385,7 +664,7 @@ class Client(ClientType):
             Response from the request.
         """
 
-        response = requests.get_student_education(login_response=self.__login_response)
+        response = self.__send(requests.get_student_education)
 
         if as_response:
             return response
@@ -409,7 +688,7 @@ class Client(ClientType):
 
         """
 
-        response = requests.get_gpax(login_response=self.__login_response)
+        response = self.__send(requests.get_gpax)
 
         if as_response:
             return response
@@ -449,11 +728,8 @@ class Client(ClientType):
         if isinstance(academic_year, int):
             academic_year = str(academic_year)
 
-        response = requests.search_enroll(
-            academic_year=academic_year,
-            semester=semester,
-            login_response=self.__login_response,
-            schedule_response=self.__schedule_response,
+        response = self.__send(
+            requests.search_enroll, academic_year=academic_year, semester=semester
         )
 
         if as_response:
@@ -466,6 +742,8 @@ class Client(ClientType):
 
         API: https://myapi.ku.th/enroll/searchSubjectOpenEnr
 
+        With a :attr:`subject_cache`, a query refining a cached query is answered without request.
+
         Parameters
         ----------
         query : str
@@ -488,13 +766,27 @@ class Client(ClientType):
         if len(query) < 3:
             raise ValueError("Subject ID must be at least 3 characters long.")
 
-        response = requests.search_subject(
-            query=query, login_response=self.__login_response
-        )
+        if self.__subject_cache is not None:
+            subjects = self.__subject_cache.get(query)
+
+            if subjects is not None:
+                return subjects
+
+        response = self.__send(requests.search_subject, query=query)
 
         response = utils.response_to_json(self.valid_response(response))
 
-        return response.get("subjects", [])
+        subjects = response.get("subjects", [])
+
+        if self.__subject_cache is not None:
+            self.__subject_cache.set(query, subjects)
+
+        if self.__catalog is not None:
+            for subject in subjects:
+                if subject.get("subjectCode"):
+                    self.__catalog.add(subject)
+
+        return subjects
 
     def search_subject_open(
         self,
@@ -529,17 +821,23 @@ class Client(ClientType):
             The request is not successful.
         """
 
-        response = requests.search_subject_open(
+        response = self.__send(
+            requests.search_subject_open,
             query=subject_id,
             section=section,
             campus_code=campus_code,
-            login_response=self.__login_response,
-            schedule_response=self.__schedule_response,
         )
 
         response = utils.response_to_json(self.valid_response(response))
 
-        return response.get("results", [])
+        sections = response.get("results", [])
+
+        if self.__catalog is not None:
+            self.__catalog.add_sections(
+                sections, campus_code, self.__academic_year, self.__semester
+            )
+
+        return sections
 
     def search_section_detail(
         self, subject_id: str
@@ -559,14 +857,193 @@ class Client(ClientType):
             _description_
         """
 
-        response = requests.search_section_detail(
-            section_id=subject_id, access_token=self.__access_token
-        )
+        response = self.__send(requests.search_section_detail, section_id=subject_id)
 
         response = utils.response_to_json(self.valid_response(response))
 
         return response.get("sectionDetail", {})
 
+    def iter_subject_open(
+        self,
+        subject_ids: Iterable[str],
+        campus_codes: Optional[Iterable[str]] = None,
+        max_workers: int = 8,
+        rate: Optional[float] = None,
+    ) -> Iterator[BulkResult]:
+        """Query the open sections of many subjects on many campuses concurrently with :meth:`search_subject_open`.
+
+        Every (subject id, campus code) pair is queried once and yielded as soon as it finishes,
+        so partial results can be used before the sweep is over.
+        Merge them with :meth:`pymyku.type.SweepResult.add` or use :meth:`sweep_subject_open`.
+
+        Parameters
+        ----------
+        subject_ids : Iterable[str]
+            Subject ids to query, e.g. ['01355119', '01204111']
+        campus_codes : Optional[Iterable[str]]
+            Campus codes to query, by default all of :attr:`pymyku.constant.CAMPUS_CODES`
+        max_workers : int
+            Maximum number of concurrent requests, by default 8
+        rate : Optional[float]
+            Maximum number of requests started per second, by default unlimited
+
+        Yields
+        ------
+        BulkResult
+            (subject id, campus code) with its list of open sections or exception, in completion order.
+        """
+
+        if campus_codes is None:
+            campus_codes = constant.CAMPUS_CODES
+
+        campus_codes = tuple(campus_codes)
+
+        keys = (
+            (subject_id, campus_code)
+            for subject_id in subject_ids
+            for campus_code in campus_codes
+        )
+
+        return bulk.run(self.__search_subject_open, keys, max_workers, rate)
+
+    def sweep_subject_open(
+        self,
+        subject_ids: Iterable[str],
+        campus_codes: Optional[Iterable[str]] = None,
+        max_workers: int = 8,
+        rate: Optional[float] = None,
+    ) -> SweepResult:
+        """Query the open sections of many subjects on many campuses and merge them.
+
+        See :meth:`iter_subject_open` for the parameters.
+
+        Returns
+        -------
+        SweepResult
+            Sections keyed by (subject id, campus code, section code) and the queries that failed.
+        """
+
+        result = SweepResult({}, {})
+
+        for subject_open in self.iter_subject_open(
+            subject_ids, campus_codes, max_workers, rate
+        ):
+            result.add(subject_open)
+
+        return result
+
+    def __search_subject_open(self, key: Tuple[str, str]) -> List[dict]:
+        """Query the open sections of a (subject id, campus code) pair."""
+
+        subject_id, campus_code = key
+
+        return self.search_subject_open(subject_id, campus_code=campus_code)
+
+    def search_section_details(
+        self, section_ids: Iterable[str], max_workers: int = 8
+    ) -> Iterator[BulkResult]:
+        """Look up the detail of many sections concurrently with :meth:`search_section_detail`.
+
+        Duplicated section ids are looked up once. A section that fails does not stop the others,
+        its exception is yielded in :attr:`pymyku.type.BulkResult.error` instead.
+
+        Parameters
+        ----------
+        section_ids : Iterable[str]
+            Section ids, e.g. the 'sectionId' of every result of :meth:`search_subject_open`
+        max_workers : int
+            Maximum number of concurrent requests, by default 8
+
+        Yields
+        ------
+        BulkResult
+            Section id with its detail or exception, in completion order.
+        """
+
+        return bulk.run(self.search_section_detail, section_ids, max_workers)
+
+    def fetch_all(
+        self,
+        endpoints: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> FetchAllResult:
+        """Fetch several independent endpoints concurrently.
+
+        Every endpoint is fetched with its `fetch_*` method and checked with :meth:`valid_response`,
+        so the wall time is close to the one of the slowest endpoint instead of the sum of all of them.
+
+        Parameters
+        ----------
+        endpoints : Optional[Iterable[str]]
+            Names of the endpoints to fetch, see :attr:`pymyku.constant.FETCH_ALL_ENDPOINTS`.
+            By default all of them.
+        max_workers : Optional[int]
+            Maximum number of requests sent at the same time, by default one per endpoint.
+
+        Returns
+        -------
+        FetchAllResult
+            Response dict of every endpoint that succeeded and exception of every endpoint that failed.
+
+        Raises
+        ------
+        ValueError
+            An endpoint is unknown.
+        """
+
+        if endpoints is None:
+            endpoints = constant.FETCH_ALL_ENDPOINTS
+
+        endpoints = tuple(dict.fromkeys(endpoints))
+
+        for endpoint in endpoints:
+            if endpoint not in constant.FETCH_ALL_ENDPOINTS:
+                raise ValueError(f"{endpoint} is not a valid endpoint")
+
+        results = {}
+        errors = {}
+
+        if not endpoints:
+            return FetchAllResult(results, errors)
+
+        fetch = self.__fetch_valid
+        bound = deadline.current()
+
+        if bound is not None:
+            fetch = bound.wrap(fetch)
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(endpoints)) as executor:
+            futures = {
+                executor.submit(fetch, endpoint): endpoint for endpoint in endpoints
+            }
+
+            for future in as_completed(futures):
+                endpoint = futures[future]
+                try:
+                    results[endpoint] = future.result()
+                except Exception as error:
+                    errors[endpoint] = error
+
+        return FetchAllResult(
+            {
+                endpoint: results[endpoint]
+                for endpoint in endpoints
+                if endpoint in results
+            },
+            {
+                endpoint: errors[endpoint]
+                for endpoint in endpoints
+                if endpoint in errors
+            },
+        )
+
+    def __fetch_valid(self, endpoint: str) -> dict:
+        """Fetch an endpoint by name and return the validated response dict."""
+
+        response = getattr(self, f"fetch_{endpoint}")(as_response=True)
+
+        return utils.response_to_json(self.valid_response(response))
+
     def get(self, attr: Enum) -> Any:
         """Get any value from MyKU client. (login response and schedule response)
         Use enums from pymyku.attribute as key to get value.
@@ -736,3 +1213,67 @@ class Client(ClientType):
         subjects = [subj for subj in response["enrollSubjects"]]
 
         return subjects
+
+    def iter_enrollment_history(
+        self, start_year: Optional[Union[str, int]] = None, max_workers: int = 8
+    ) -> Iterator[BulkResult]:
+        """Get the enrolled subjects of every semester since admission concurrently with :meth:`get_enrolled_subjects`.
+
+        Every semester, summer included, from the first semester of `start_year`
+        up to the current semester is queried once and yielded as soon as it finishes.
+
+        Parameters
+        ----------
+        start_year : Optional[Union[str, int]]
+            First academic year, by default the admission year of the student,
+            see :meth:`pymyku.utils.extract_admission_year`
+        max_workers : int
+            Maximum number of concurrent requests, by default 8
+
+        Yields
+        ------
+        BulkResult
+            (academic year, semester) with its list of enrolled subjects or exception, in completion order.
+        """
+
+        if start_year is None:
+            start_year = utils.extract_admission_year(
+                self.__login_response, self.__academic_year
+            )
+
+        semesters = utils.gen_semesters(
+            start_year, self.__academic_year, self.__semester
+        )
+
+        return bulk.run(self.__get_enrolled_subjects, semesters, max_workers)
+
+    def get_enrollment_history(
+        self, start_year: Optional[Union[str, int]] = None, max_workers: int = 8
+    ) -> EnrollmentHistory:
+        """Get the enrolled subjects of every semester since admission, oldest first.
+
+        See :meth:`iter_enrollment_history` for the parameters.
+
+        Returns
+        -------
+        EnrollmentHistory
+            Enrollment of every semester in time order and the semesters that failed.
+        """
+
+        semesters = []
+        errors = {}
+
+        for result in self.iter_enrollment_history(start_year, max_workers):
+            if result.ok:
+                semesters.append(SemesterEnrollment(*result.key, result.result))
+            else:
+                errors[result.key] = result.error
+
+        semesters.sort(key=lambda enrollment: utils.semester_key(*enrollment[:2]))
+
+        return EnrollmentHistory(semesters, errors)
+
+    def __get_enrolled_subjects(self, key: Tuple[str, str]) -> List[dict]:
+        academic_year, semester = key
+
+        return self.get_enrolled_subjects(academic_year, semester)
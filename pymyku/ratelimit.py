@@ -0,0 +1,232 @@
+import sqlite3
+import threading
+import time
+
+from ._sqlite import Transaction
+from .type import Dict, Optional, Tuple
+
+#: Bucket name of the limit shared by every API.
+GLOBAL = "*"
+
+
+def _reserve(
+    tokens: float, updated: float, now: float, rate: float, burst: float, cost: float
+) -> Tuple[float, float]:
+    """Refill a bucket up to `burst` and take `cost` tokens from it, possibly going into debt.
+
+    Returns
+    -------
+    Tuple[float, float]
+        Tokens left, negative when in debt, and seconds to wait for the taken tokens.
+    """
+
+    tokens = min(burst, tokens + max(now - updated, 0) * rate) - cost
+
+    return tokens, max(-tokens / rate, 0.0)
+
+
+class RateLimiter(object):
+    """Token bucket rate limiter with a global limit and a limit per API.
+
+    A bucket holds up to `burst` tokens and refills at `rate` tokens per second.
+    Every request takes one token from the global bucket and one from the bucket of its API.
+    When a bucket is empty, the slot is reserved and the caller sleeps until it comes,
+    so waiting callers are served in order without polling.
+
+    The buckets live in memory and are shared by the threads using the limiter.
+    With a `path`, they live in a SQLite database and are shared by every process using the same file.
+
+    Pass the limiter to :class:`pymyku.Session` to limit every request sent through the session.
+
+    Parameters
+    ----------
+    rate : Optional[float]
+        Requests per second for all APIs together, by default unlimited
+    burst : Optional[float]
+        Requests that can be sent at once for all APIs together, by default `rate` (one second worth)
+    limits : Optional[Dict[str, Tuple[float, float]]]
+        (rate, burst) per API (:mod:`pymyku.url`), by default none
+    path : Optional[str]
+        Path of a SQLite database to share the buckets between processes, by default in memory
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        self.__limits: Dict[str, Tuple[float, float]] = dict(limits or {})
+
+        if rate is not None:
+            self.__limits[GLOBAL] = (rate, burst if burst is not None else max(rate, 1))
+
+        for name, (bucket_rate, bucket_burst) in self.__limits.items():
+            if bucket_rate <= 0 or bucket_burst < 1:
+                raise ValueError(
+                    f"invalid limit of {name}: rate must be > 0, burst >= 1"
+                )
+
+        self.__path: Optional[str] = path
+        self.__lock = threading.Lock()
+        self.__buckets: Dict[str, Tuple[float, float]] = {}
+        self.__local = threading.local()
+        self.__acquired: int = 0
+        self.__delayed: int = 0
+        self.__waited: float = 0.0
+
+        if path is not None:
+            with self.__transaction() as connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS buckets "
+                    "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+                )
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Limiter usage of this process.
+
+        Returns
+        -------
+        Dict[str, float]
+            Number of `acquired` slots, number of `delayed` requests and total seconds `waited`.
+        """
+        with self.__lock:
+            return {
+                "acquired": self.__acquired,
+                "delayed": self.__delayed,
+                "waited": self.__waited,
+            }
+
+    def __connection(self) -> sqlite3.Connection:
+        connection = getattr(self.__local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.__path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self.__local.connection = connection
+
+        return connection
+
+    def __transaction(self) -> Transaction:
+        return Transaction(self.__connection())
+
+    def __names(self, api: Optional[str]) -> Tuple[str, ...]:
+        return tuple(name for name in (GLOBAL, api) if name in self.__limits)
+
+    def __take(self, api: Optional[str], cost: float) -> float:
+        """Take `cost` tokens from the buckets of `api` and return the seconds to wait for them."""
+
+        names = self.__names(api)
+
+        if not names:
+            return 0.0
+
+        if self.__path is None:
+            # Monotonic time, the buckets never leave this process.
+            now = time.monotonic()
+
+            with self.__lock:
+                return self.__take_from(self.__buckets, names, now, cost)
+
+        now = time.time()
+
+        with self.__transaction() as connection:
+            rows = connection.execute(
+                f"SELECT name, tokens, updated FROM buckets WHERE name IN ({','.join('?' * len(names))})",
+                names,
+            ).fetchall()
+            buckets = {name: (tokens, updated) for name, tokens, updated in rows}
+
+            wait = self.__take_from(buckets, names, now, cost)
+
+            connection.executemany(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                [(name,) + buckets[name] for name in names],
+            )
+
+        return wait
+
+    def __take_from(
+        self,
+        buckets: Dict[str, Tuple[float, float]],
+        names: Tuple[str, ...],
+        now: float,
+        cost: float,
+    ) -> float:
+        wait = 0.0
+
+        for name in names:
+            rate, burst = self.__limits[name]
+            tokens, updated = buckets.get(name, (burst, now))
+            tokens, bucket_wait = _reserve(tokens, updated, now, rate, burst, cost)
+            buckets[name] = (tokens, now)
+            wait = max(wait, bucket_wait)
+
+        return wait
+
+    def delay(self, api: Optional[str] = None) -> float:
+        """Seconds until a request to an API could be sent without waiting, nothing is reserved.
+
+        Parameters
+        ----------
+        api : Optional[str]
+            API of the request, one of :mod:`pymyku.url`. By default only the global limit is checked.
+
+        Returns
+        -------
+        float
+            Seconds until the next free slot, 0 if a request can be sent now.
+        """
+
+        names = self.__names(api)
+
+        if not names:
+            return 0.0
+
+        if self.__path is None:
+            with self.__lock:
+                buckets = dict(self.__buckets)
+            now = time.monotonic()
+        else:
+            rows = (
+                self.__connection()
+                .execute("SELECT name, tokens, updated FROM buckets")
+                .fetchall()
+            )
+            buckets = {name: (tokens, updated) for name, tokens, updated in rows}
+            now = time.time()
+
+        # Taken from a copy of the buckets, so nothing is reserved.
+        return self.__take_from(buckets, names, now, 1)
+
+    def acquire(self, api: Optional[str] = None, blocking: bool = True) -> float:
+        """Reserve a slot for a request to an API and sleep until it comes.
+
+        Parameters
+        ----------
+        api : Optional[str]
+            API of the request, one of :mod:`pymyku.url`. By default only the global limit applies.
+        blocking : bool
+            Sleep until the slot, by default True. Otherwise the caller must wait the returned seconds.
+
+        Returns
+        -------
+        float
+            Seconds waited, or to wait if not `blocking`.
+        """
+
+        wait = self.__take(api, 1)
+
+        with self.__lock:
+            self.__acquired += 1
+
+            if wait > 0:
+                self.__delayed += 1
+                self.__waited += wait
+
+        if wait > 0 and blocking:
+            time.sleep(wait)
+
+        return wait
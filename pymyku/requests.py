@@ -1,11 +1,42 @@
-from requests import get
-from requests import post
+from requests import request
 
-from . import utils
+from . import constant, deadline, utils
+from .session import Session
 from .type import ClientType, Optional, Response, Union
 
 
-def login(username: str, password: str) -> Response:
+def _send(
+    method: str,
+    params: dict,
+    session: Optional[Session] = None,
+    client: Optional[ClientType] = None,
+) -> Response:
+    """Send a request with the parameters generated by :meth:`pymyku.utils.gen_request_args_f`.
+
+    The request is sent through `session` if given, otherwise through the session of `client`.
+    Without both, a one-off connection is used, with the default :attr:`pymyku.constant.TIMEOUT`
+    capped by the :class:`pymyku.Deadline` of the thread.
+    If `client` has a :class:`pymyku.cache.ResponseCache`, the request is answered from it when possible.
+    """
+
+    if session is None and client is not None:
+        session = getattr(client, "session", None)
+
+    def send(params: dict) -> Response:
+        if session is None:
+            return request(method, timeout=deadline.timeout(constant.TIMEOUT), **params)
+
+        return session.request(method, **params)
+
+    cache = getattr(client, "cache", None)
+
+    if cache is None:
+        return send(params)
+
+    return cache.request(method, params, send, getattr(client, "std_code", None))
+
+
+def login(username: str, password: str, session: Optional[Session] = None) -> Response:
     """Send POST request to MyKU auth/login API.
 
     API: https://myapi.ku.th/auth/login
@@ -16,6 +47,8 @@ def login(username: str, password: str) -> Response:
         Your Nontri account username (b##########)
     password : str
         Your password (Don't worry, your password is not saved)
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with
 
     Returns
     -------
@@ -28,13 +61,14 @@ def login(username: str, password: str) -> Response:
     username = utils.encrypt(username)
     password = utils.encrypt(password)
 
-    return post(**utils.gen_login_request_params(username, password))
+    return _send("POST", utils.gen_login_request_params(username, password), session)
 
 
 def logout(
     access_token: Optional[str] = "",
     login_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send POST request to MyKU auth/logout API.
 
@@ -53,6 +87,8 @@ def logout(
         Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -67,7 +103,52 @@ def logout(
 
     params = utils.gen_request_args_f(logout, **locals())
 
-    return post(**params)
+    return _send("POST", params, session, client)
+
+
+def renew(
+    renew_token: Optional[str] = "",
+    access_token: Optional[str] = "",
+    login_response: Optional[Union[Response, dict]] = {},
+    client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
+) -> Response:
+    """Send POST request to MyKU auth/renew API to get a new access token without logging in again.
+
+    *I am uncertain that this request method will work properly.*
+
+    Assigning only `login_response` or `client` is acceptable.
+
+    API: https://myapi.ku.th/auth/renew
+
+    Parameters
+    ----------
+    renew_token : Optional[str]
+        'renewtoken' from login response, Represented by :class:`pymyku.attribute.Token.RENEW_TOKEN`
+    access_token : Optional[str]
+        'accesstoken' from login response, Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+    login_response : Optional[Union[Response, dict]]
+        Login response from login request, can be obtained from :meth:`login`
+        Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
+    client : Optional[ClientType]
+        Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
+
+    Returns
+    -------
+    Response
+        Response object from auth/renew API.
+
+    Raises
+    ------
+    ValueError
+        Required parameters are missing.
+    """
+
+    params = utils.gen_request_args_f(renew, **locals())
+
+    return _send("POST", params, session, client)
 
 
 def get_schedule(
@@ -79,6 +160,7 @@ def get_schedule(
     student_status_code: Optional[str] = "",
     login_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU common/getschedule API.
 
@@ -106,6 +188,8 @@ def get_schedule(
         Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -119,7 +203,7 @@ def get_schedule(
     """
     params = utils.gen_request_args_f(get_schedule, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def get_group_course(
@@ -130,6 +214,7 @@ def get_group_course(
     login_response: Optional[Union[Response, dict]] = {},
     schedule_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU std-profile/getGroupCourse API.
 
@@ -158,6 +243,8 @@ def get_group_course(
         Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -172,7 +259,7 @@ def get_group_course(
 
     params = utils.gen_request_args_f(get_group_course, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def get_check_grades(
@@ -180,6 +267,7 @@ def get_check_grades(
     std_code: Optional[str] = "",
     login_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU std-profile/checkGrades API.
 
@@ -200,6 +288,8 @@ def get_check_grades(
         Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -214,7 +304,7 @@ def get_check_grades(
 
     params = utils.gen_request_args_f(get_check_grades, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def get_gpax(
@@ -222,6 +312,7 @@ def get_gpax(
     std_id: Optional[str] = "",
     login_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU stddashboard/gpax API.
 
@@ -241,6 +332,8 @@ def get_gpax(
         Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -255,7 +348,7 @@ def get_gpax(
 
     params = utils.gen_request_args_f(get_gpax, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def get_announce(
@@ -266,6 +359,7 @@ def get_announce(
     login_response: Optional[Union[Response, dict]] = {},
     schedule_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU advisor/getAnnounceStd API.
 
@@ -294,6 +388,8 @@ def get_announce(
         Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -308,7 +404,7 @@ def get_announce(
 
     params = utils.gen_request_args_f(get_announce, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def search_enroll(
@@ -319,6 +415,7 @@ def search_enroll(
     login_response: Optional[Union[Response, dict]] = {},
     schedule_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU enroll/searchEnrollResult API.
 
@@ -347,6 +444,8 @@ def search_enroll(
         Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -361,7 +460,7 @@ def search_enroll(
 
     params = utils.gen_request_args_f(search_enroll, **locals())
 
-    return post(**params)
+    return _send("POST", params, session, client)
 
 
 def get_student_personal(
@@ -369,6 +468,7 @@ def get_student_personal(
     std_id: Optional[str] = "",
     login_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU std-profile/getStdPersonal API.
 
@@ -388,6 +488,8 @@ def get_student_personal(
         Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -402,7 +504,7 @@ def get_student_personal(
 
     params = utils.gen_request_args_f(get_student_personal, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def get_student_education(
@@ -410,6 +512,7 @@ def get_student_education(
     std_id: Optional[str] = "",
     login_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU std-profile/getStdEducation API.
 
@@ -429,6 +532,8 @@ def get_student_education(
         Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -442,7 +547,7 @@ def get_student_education(
     """
     params = utils.gen_request_args_f(get_student_education, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def get_student_address(
@@ -450,6 +555,7 @@ def get_student_address(
     std_id: Optional[str] = "",
     login_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU std-profile/getStdAddress API.
 
@@ -469,6 +575,8 @@ def get_student_address(
         Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -483,7 +591,7 @@ def get_student_address(
 
     params = utils.gen_request_args_f(get_student_address, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def search_subject(
@@ -491,6 +599,7 @@ def search_subject(
     access_token: Optional[str] = "",
     login_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU enroll/searchSubjectOpenEnr API.
 
@@ -509,6 +618,8 @@ def search_subject(
         Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -523,7 +634,7 @@ def search_subject(
 
     params = utils.gen_request_args_f(search_subject, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def search_subject_open(
@@ -536,6 +647,7 @@ def search_subject_open(
     login_response: Optional[Union[Response, dict]] = {},
     schedule_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU enroll/openSubjectForEnroll API.
 
@@ -569,6 +681,8 @@ def search_subject_open(
         Represented by :class:`pymyku.attribute.FetchedResponses.SCHEDULE_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -583,7 +697,7 @@ def search_subject_open(
 
     params = utils.gen_request_args_f(search_subject_open, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
 
 
 def search_section_detail(
@@ -591,6 +705,7 @@ def search_section_detail(
     access_token: Optional[str] = "",
     login_response: Optional[Union[Response, dict]] = {},
     client: Optional[ClientType] = None,
+    session: Optional[Session] = None,
 ) -> Response:
     """Send GET request to MyKU enroll/searchSectionDetail API.
 
@@ -607,6 +722,8 @@ def search_section_detail(
         Represented by :class:`pymyku.attribute.FetchedResponses.LOGIN_RESPONSE`
     client : Optional[ClientType]
         Initialized :class:`pymyku.Client` object
+    session : Optional[Session]
+        Pooled :class:`pymyku.Session` to send the request with, by default the session of `client`
 
     Returns
     -------
@@ -621,4 +738,4 @@ def search_section_detail(
 
     params = utils.gen_request_args_f(search_section_detail, **locals())
 
-    return get(**params)
+    return _send("GET", params, session, client)
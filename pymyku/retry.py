@@ -0,0 +1,267 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from requests.exceptions import ConnectionError, Timeout
+
+from . import deadline
+from .exception import DeadlineExceeded
+from .type import Callable, Dict, Iterable, Optional, Response
+
+#: Status codes of the responses worth retrying: rate limited, server errors and unavailable.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(response: Response) -> Optional[float]:
+    """Seconds to wait asked by the Retry-After header of a response.
+
+    Parameters
+    ----------
+    response : Response
+        The response.
+
+    Returns
+    -------
+    Optional[float]
+        Seconds to wait, None if the response has no valid Retry-After header.
+    """
+
+    value = response.headers.get("Retry-After")
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy(object):
+    """Retry transient failures with capped exponential backoff and full jitter.
+
+    Connection errors, timeouts and responses with a status in `statuses` are retried.
+    Only GET requests are retried, POST requests only for the APIs in `post_apis`,
+    e.g. :attr:`pymyku.url.SEARCH_ENROLL` which only reads.
+    The wait before the n-th retry is random between 0 and ``min(max_backoff, backoff * 2 ** n)``,
+    or the Retry-After of the response if longer.
+    A response asking to wait more than `max_backoff` is not retried.
+
+    A retry budget stops retry storms when MyKU is down: every request earns `budget_ratio` retry,
+    up to `budget_ratio` times 100 saved, every retry spends one,
+    and `budget_min` retries can be spent on top of the earned ones.
+
+    Within a :class:`pymyku.Deadline`, a request is not retried when the wait would outlast the deadline.
+
+    Pass the policy to :class:`pymyku.Session` to retry every request sent through the session.
+
+    Parameters
+    ----------
+    max_attempts : int
+        Maximum number of attempts of a request, the first one included, by default 3
+    backoff : float
+        Seconds of the first backoff, doubled at every retry, by default 0.5
+    max_backoff : float
+        Maximum seconds to wait before a retry, by default 30,
+        a response with a longer Retry-After is returned without retrying
+    statuses : Iterable[int]
+        Status codes to retry, by default :attr:`RETRY_STATUSES`
+    post_apis : Iterable[str]
+        APIs (:mod:`pymyku.url`) whose POST requests can be retried, by default none
+    budget_ratio : float
+        Retries earned by every request, by default 0.2
+    budget_min : float
+        Retries allowed on top of the earned ones, by default 10
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        statuses: Iterable[int] = RETRY_STATUSES,
+        post_apis: Iterable[str] = (),
+        budget_ratio: float = 0.2,
+        budget_min: float = 10,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self.__max_attempts: int = max_attempts
+        self.__backoff: float = backoff
+        self.__max_backoff: float = max_backoff
+        self.__statuses: frozenset = frozenset(statuses)
+        self.__post_apis: frozenset = frozenset(post_apis)
+        self.__budget_ratio: float = budget_ratio
+        self.__budget_min: float = budget_min
+        self.__budget: float = 0.0
+        self.__lock = threading.Lock()
+        self.__requests: int = 0
+        self.__retries: int = 0
+        self.__recovered: int = 0
+        self.__exhausted: int = 0
+        self.__denied: int = 0
+        self.__deferred: int = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Retry usage.
+
+        Returns
+        -------
+        Dict[str, int]
+            Number of `requests`, `retries`, `recovered` requests that succeeded after a retry,
+            `exhausted` requests that failed after `max_attempts`, retries `denied` by the budget,
+            and `deferred` requests not retried as their Retry-After is longer than `max_backoff`.
+        """
+        with self.__lock:
+            return {
+                "requests": self.__requests,
+                "retries": self.__retries,
+                "recovered": self.__recovered,
+                "exhausted": self.__exhausted,
+                "denied": self.__denied,
+                "deferred": self.__deferred,
+            }
+
+    def retryable(self, method: str, api: str) -> bool:
+        """Check if the requests of a method to an API can be retried.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+        api : str
+            API of the request, one of :mod:`pymyku.url`
+
+        Returns
+        -------
+        bool
+            True for GET requests and the POST requests to `post_apis`.
+        """
+
+        method = method.upper()
+
+        return method == "GET" or (method == "POST" and api in self.__post_apis)
+
+    def delay(self, retry: int, response: Optional[Response] = None) -> float:
+        """Seconds to wait before a retry.
+
+        Parameters
+        ----------
+        retry : int
+            Number of the retry, 0 for the first one.
+        response : Optional[Response]
+            Failed response, for its Retry-After header.
+
+        Returns
+        -------
+        float
+            Seconds to wait, at most `max_backoff` unless the Retry-After is longer.
+        """
+
+        delay = random.uniform(0, min(self.__max_backoff, self.__backoff * 2**retry))
+
+        if response is not None:
+            retry_after = parse_retry_after(response)
+
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+        return delay
+
+    def call(self, method: str, api: str, send: Callable[[], Response]) -> Response:
+        """Send a request and retry it while it fails transiently.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+        api : str
+            API of the request, one of :mod:`pymyku.url`
+        send : Callable[[], Response]
+            Function sending the request once.
+
+        Returns
+        -------
+        Response
+            The first response that is not retried, possibly a failed one.
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            The last connection error or timeout, when it is not retried.
+        """
+
+        with self.__lock:
+            self.__requests += 1
+            self.__budget = min(
+                self.__budget + self.__budget_ratio, self.__budget_ratio * 100
+            )
+
+        retryable = self.retryable(method, api)
+        retry = 0
+
+        while True:
+            try:
+                response = send()
+            except DeadlineExceeded:
+                raise
+            except (ConnectionError, Timeout):
+                delay = self.delay(retry)
+
+                if not retryable or not self.__spend(retry, delay):
+                    raise
+            else:
+                if response.status_code not in self.__statuses:
+                    if retry:
+                        with self.__lock:
+                            self.__recovered += 1
+                    return response
+
+                if not retryable:
+                    return response
+
+                delay = self.delay(retry, response)
+
+                if delay > self.__max_backoff:
+                    # Retrying sooner than the server asked would only be refused again.
+                    with self.__lock:
+                        self.__deferred += 1
+                    return response
+
+                if not self.__spend(retry, delay):
+                    return response
+
+                response.close()
+
+            time.sleep(delay)
+            retry += 1
+
+    def __spend(self, retry: int, delay: float) -> bool:
+        """Spend a retry of the budget, False if the request must not be retried any more."""
+
+        left = deadline.remaining()
+
+        if left is not None and delay >= left:
+            # The wait would outlast the deadline of the thread.
+            return False
+
+        with self.__lock:
+            if retry + 1 >= self.__max_attempts:
+                self.__exhausted += 1
+                return False
+
+            if self.__budget + self.__budget_min < 1:
+                self.__denied += 1
+                return False
+
+            self.__budget -= 1
+            self.__retries += 1
+            return True
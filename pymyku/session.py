@@ -0,0 +1,325 @@
+import threading
+
+from requests import Session as RequestsSession
+from requests.adapters import HTTPAdapter
+from requests.exceptions import Timeout
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+from . import constant, deadline
+from .breaker import Bulkhead, CircuitBreaker
+from .deadline import TimeoutType
+from .exception import DeadlineExceeded
+from .hedge import HedgePolicy
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .type import Dict, Optional
+
+
+class _CountingPool(object):
+    """Connection pool mixin that reports every newly opened connection."""
+
+    counter: Optional[callable] = None
+
+    def _new_conn(self):
+        if self.counter is not None:
+            self.counter()
+        return super()._new_conn()
+
+
+class _HTTPConnectionPool(_CountingPool, HTTPConnectionPool):
+    pass
+
+
+class _HTTPSConnectionPool(_CountingPool, HTTPSConnectionPool):
+    pass
+
+
+class _CountingPoolManager(PoolManager):
+    """Pool manager that hands a connection counter to every pool it creates."""
+
+    def __init__(self, *args, counter: Optional[callable] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.counter = counter
+        self.pool_classes_by_scheme = {
+            "http": _HTTPConnectionPool,
+            "https": _HTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.counter = self.counter
+        return pool
+
+
+class PoolAdapter(HTTPAdapter):
+    """HTTP adapter with keep-alive connection pools that counts connection reuse.
+
+    Parameters
+    ----------
+    pool_connections : int
+        Number of hosts to keep connection pools for, by default 4
+    pool_maxsize : int
+        Maximum number of idle keep-alive connections kept per host, by default 10
+    pool_block : bool
+        Block when every connection of a host is busy instead of opening
+        a throwaway connection, by default False
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+    ) -> None:
+        self.__lock = threading.Lock()
+        self.__requests = 0
+        self.__connections = 0
+
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+        self.poolmanager = _CountingPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            counter=self.__count_connection,
+            **pool_kwargs,
+        )
+
+    def send(self, request, *args, **kwargs):
+        with self.__lock:
+            self.__requests += 1
+
+        return super().send(request, *args, **kwargs)
+
+    def __count_connection(self) -> None:
+        with self.__lock:
+            self.__connections += 1
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Connection usage of the adapter.
+
+        Returns
+        -------
+        Dict[str, int]
+            `requests` sent, `connections` opened and `reused` connections
+            (requests that did not need a new TCP/TLS handshake).
+        """
+        with self.__lock:
+            return {
+                "requests": self.__requests,
+                "connections": self.__connections,
+                "reused": max(self.__requests - self.__connections, 0),
+            }
+
+
+class Session(RequestsSession):
+    """Pooled keep-alive HTTP session used to send requests to MyKU.
+
+    A session can be passed to every function in :mod:`pymyku.requests` with `session=`
+    and is owned by :class:`pymyku.Client`, so that consecutive requests reuse
+    the same TCP/TLS connection instead of opening a new one each time.
+
+    The session can be used as a context manager, the pooled connections are closed on exit.
+
+    With a `rate_limiter`, every request waits for a slot of its API before it is sent.
+    With a `retry` policy, transient failures are retried, every attempt waiting for its own slot.
+    With a `breaker`, every attempt fails fast while the circuit of its API is open.
+    With a `bulkhead`, a request holds a slot of its API, retries included, until it is done.
+    With a `hedge` policy, a slow attempt is sent a second time and the first answer is used.
+
+    Every attempt is sent with the `timeout` of its API, unless the caller passes its own.
+    Inside a :class:`pymyku.Deadline`, the timeouts and waits are capped to the time left
+    and :class:`pymyku.exception.DeadlineExceeded` is raised once it is spent.
+
+    Parameters
+    ----------
+    pool_connections : int
+        Number of hosts to keep connection pools for, by default 4
+    pool_maxsize : int
+        Maximum number of idle keep-alive connections kept per host.
+        Should be at least the number of threads sharing the session, by default 10
+    pool_block : bool
+        Block when every connection of a host is busy instead of opening
+        a throwaway connection, by default False
+    rate_limiter : Optional[RateLimiter]
+        Rate limiter of the requests, by default unlimited
+    retry : Optional[RetryPolicy]
+        Retry policy of the requests, by default no retry
+    breaker : Optional[CircuitBreaker]
+        Circuit breaker of the requests, by default none
+    bulkhead : Optional[Bulkhead]
+        Concurrency cap of the requests per API, by default none
+    hedge : Optional[HedgePolicy]
+        Hedging policy of the slow GET requests, by default no hedging
+    timeout : TimeoutType
+        Timeout of the requests, seconds or (connect, read) seconds, None to wait forever,
+        by default :attr:`pymyku.constant.TIMEOUT`
+    timeouts : Optional[Dict[str, TimeoutType]]
+        Timeout per API (:mod:`pymyku.url`) overriding `timeout`, by default none
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        bulkhead: Optional[Bulkhead] = None,
+        hedge: Optional[HedgePolicy] = None,
+        timeout: TimeoutType = constant.TIMEOUT,
+        timeouts: Optional[Dict[str, TimeoutType]] = None,
+    ) -> None:
+        super().__init__()
+
+        self.__rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.__retry: Optional[RetryPolicy] = retry
+        self.__breaker: Optional[CircuitBreaker] = breaker
+        self.__bulkhead: Optional[Bulkhead] = bulkhead
+        self.__hedge: Optional[HedgePolicy] = hedge
+        self.__timeout: TimeoutType = timeout
+        self.__timeouts: Dict[str, TimeoutType] = dict(timeouts or {})
+
+        self.__adapter = PoolAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+        self.mount("https://", self.__adapter)
+        self.mount("http://", self.__adapter)
+
+        self.headers["Connection"] = "keep-alive"
+
+    def timeout_for(self, api: str) -> TimeoutType:
+        """Timeout of the requests to an API.
+
+        Parameters
+        ----------
+        api : str
+            API of the request, one of :mod:`pymyku.url`
+
+        Returns
+        -------
+        TimeoutType
+            Seconds or (connect, read) seconds, None to wait forever.
+        """
+
+        return self.__timeouts.get(api, self.__timeout)
+
+    def request(self, method, url, *args, **kwargs):
+        timeout = (
+            kwargs.pop("timeout") if "timeout" in kwargs else self.timeout_for(url)
+        )
+
+        def send():
+            deadline.check()
+
+            if self.__rate_limiter is not None:
+                left = deadline.remaining()
+
+                # Checked before reserving, a rejected request must not take a slot.
+                if left is not None and self.__rate_limiter.delay(url) >= left:
+                    raise DeadlineExceeded(
+                        f"The rate limit of {url} would delay the request past the deadline."
+                    )
+
+                self.__rate_limiter.acquire(url)
+
+            try:
+                return super(Session, self).request(
+                    method, url, *args, timeout=deadline.timeout(timeout), **kwargs
+                )
+            except Timeout as error:
+                if deadline.remaining() == 0:
+                    raise DeadlineExceeded(
+                        f"The request to {url} was cut short by the deadline."
+                    ) from error
+                raise
+
+        def guarded():
+            if self.__breaker is None:
+                return send()
+
+            return self.__breaker.call(url, send)
+
+        def attempt():
+            if self.__hedge is None:
+                return guarded()
+
+            return self.__hedge.call(method, url, guarded)
+
+        def call():
+            if self.__retry is None:
+                return attempt()
+
+            return self.__retry.call(method, url, attempt)
+
+        if self.__bulkhead is None:
+            return call()
+
+        return self.__bulkhead.call(url, call)
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Rate limiter of the requests, None if unlimited."""
+        return self.__rate_limiter
+
+    @property
+    def retry(self) -> Optional[RetryPolicy]:
+        """Retry policy of the requests, None if they are not retried."""
+        return self.__retry
+
+    @property
+    def breaker(self) -> Optional[CircuitBreaker]:
+        """Circuit breaker of the requests, None if there is none."""
+        return self.__breaker
+
+    @property
+    def bulkhead(self) -> Optional[Bulkhead]:
+        """Concurrency cap of the requests per API, None if there is none."""
+        return self.__bulkhead
+
+    @property
+    def hedge(self) -> Optional[HedgePolicy]:
+        """Hedging policy of the slow GET requests, None if they are not hedged."""
+        return self.__hedge
+
+    @property
+    def timeout(self) -> TimeoutType:
+        """Timeout of the requests to the APIs without their own, None to wait forever."""
+        return self.__timeout
+
+    @property
+    def adapter(self) -> PoolAdapter:
+        """The pooled adapter mounted for both http and https.
+
+        Returns
+        -------
+        PoolAdapter
+            The adapter owning the connection pools.
+        """
+        return self.__adapter
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Connection usage of the session.
+
+        Returns
+        -------
+        Dict[str, int]
+            `requests` sent, `connections` opened and `reused` connections.
+        """
+        return self.__adapter.stats
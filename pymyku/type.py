@@ -1,5 +1,18 @@
 from enum import Enum, EnumMeta
-from typing import Any, Dict, List, Optional, Union, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Union,
+    Tuple,
+)
 
 from requests import Response
 
@@ -8,3 +21,147 @@ class ClientType(object):
     """Abstract class for client"""
 
     pass
+
+
+class FetchAllResult(NamedTuple):
+    """Results of :meth:`pymyku.Client.fetch_all`, keyed by endpoint name."""
+
+    #: Response dict of every endpoint that succeeded.
+    results: Dict[str, Any]
+    #: Exception raised by every endpoint that failed.
+    errors: Dict[str, Exception]
+
+    @property
+    def ok(self) -> bool:
+        """True if every endpoint succeeded."""
+        return not self.errors
+
+    def __getitem__(self, endpoint):
+        if isinstance(endpoint, str):
+            if endpoint in self.errors:
+                raise self.errors[endpoint]
+            return self.results[endpoint]
+        return tuple.__getitem__(self, endpoint)
+
+
+class BulkResult(NamedTuple):
+    """Outcome of one call of a bulk operation such as :meth:`pymyku.Client.search_section_details`."""
+
+    #: Key the call was made for, e.g. a section id.
+    key: Any
+    #: Result of the call, None if it failed.
+    result: Any
+    #: Exception raised by the call, None if it succeeded.
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        """True if the call succeeded."""
+        return self.error is None
+
+
+class SweepResult(NamedTuple):
+    """Open sections found by :meth:`pymyku.Client.sweep_subject_open`."""
+
+    #: Section dict keyed by (subject id, campus code, section code).
+    sections: Dict[Tuple[str, str, str], dict]
+    #: Exception raised by every (subject id, campus code) query that failed.
+    errors: Dict[Tuple[str, str], Exception]
+
+    @property
+    def ok(self) -> bool:
+        """True if every query succeeded."""
+        return not self.errors
+
+    def add(self, result: BulkResult) -> None:
+        """Merge one result of :meth:`pymyku.Client.iter_subject_open` into the sweep.
+
+        Parameters
+        ----------
+        result : BulkResult
+            Result keyed by (subject id, campus code) holding the list of open sections.
+        """
+
+        subject_id, campus_code = result.key
+
+        if not result.ok:
+            self.errors[result.key] = result.error
+            return
+
+        self.errors.pop(result.key, None)
+
+        for section in result.result:
+            key = (subject_id, campus_code, section.get("sectionCode"))
+            self.sections[key] = section
+
+
+class SemesterEnrollment(NamedTuple):
+    """Subjects enrolled in one semester, see :meth:`pymyku.Client.get_enrollment_history`."""
+
+    #: Academic year, e.g. '2565'
+    academic_year: str
+    #: Semester. Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+    semester: str
+    #: Enrolled subject dicts.
+    subjects: List[dict]
+
+
+class EnrollmentHistory(NamedTuple):
+    """Enrollment of every semester since admission, see :meth:`pymyku.Client.get_enrollment_history`."""
+
+    #: Enrollment of every semester that succeeded, oldest first.
+    semesters: List[SemesterEnrollment]
+    #: Exception raised by every (academic year, semester) that failed.
+    errors: Dict[Tuple[str, str], Exception]
+
+    @property
+    def ok(self) -> bool:
+        """True if every semester succeeded."""
+        return not self.errors
+
+    @property
+    def subjects(self) -> List[dict]:
+        """Enrolled subject dicts of every semester, oldest first."""
+        return [subject for semester in self.semesters for subject in semester.subjects]
+
+
+class SubjectMatch(NamedTuple):
+    """Subject found by :meth:`pymyku.catalog.SubjectCatalog.search_fuzzy`."""
+
+    #: The subject dict.
+    subject: dict
+    #: Similarity of the subject name to the query, between 0 and 1.
+    score: float
+
+
+class CrawlResult(NamedTuple):
+    """Outcome of :meth:`pymyku.crawler.Crawler.run`."""
+
+    #: Number of new subjects found.
+    subjects: int
+    #: Number of prefixes crawled successfully.
+    prefixes: int
+    #: Exception raised by every prefix that failed, retried by the next run.
+    errors: Dict[str, Exception]
+
+    @property
+    def ok(self) -> bool:
+        """True if every prefix succeeded."""
+        return not self.errors
+
+
+class Task(NamedTuple):
+    """Call of a :mod:`pymyku.requests` function leased from a :class:`pymyku.workqueue.WorkQueue`."""
+
+    #: Id of the task in the queue.
+    id: int
+    #: Unique key of the task.
+    key: str
+    #: Name of the :mod:`pymyku.requests` function.
+    function: str
+    #: Arguments of the function, the client excluded.
+    kwargs: Dict[str, Any]
+    #: Number of the lease, the fencing token of the worker.
+    attempts: int
+    #: Name of the worker holding the lease.
+    worker: str
@@ -2,6 +2,8 @@
 LOGIN: str = 'https://myapi.ku.th/auth/login'
 #: API for logging out from MyKU (unsure if this works). API response -- :ref:`:attr:`url.logout``
 LOGOUT: str = 'https://myapi.ku.th/auth/logout'
+#: API for renewing the access token with the renew token (unsure if this works). API response -- :ref:`:attr:`url.renew``
+RENEW: str = 'https://myapi.ku.th/auth/renew'
 
 
 #: API for getting schedule data that contains academic year and semester. API response -- :ref:`:attr:`url.schedule``
@@ -32,3 +34,6 @@ SEARCH_SUBJECT: str = 'https://myapi.ku.th/enroll/searchSubjectOpenEnr'
 SEARCH_SUBJECT_OPEN: str = 'https://myapi.ku.th/enroll/openSubjectForEnroll'
 #: API for getting section detail by section id. API response -- :ref:`:attr:`url.search_section_detail``
 SEARCH_SECTION_DETAIL: str = 'https://myapi.ku.th/enroll/searchSectionDetail'
+
+#: APIs whose responses do not depend on the user sending the request.
+PUBLIC: tuple = (SCHEDULE, SEARCH_SUBJECT, SEARCH_SUBJECT_OPEN, SEARCH_SECTION_DETAIL)
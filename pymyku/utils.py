@@ -5,14 +5,18 @@ from .type import (
     Dict,
     Enum,
     EnumMeta,
+    List,
     Optional,
     Response,
+    Tuple,
     Union,
 )
 
 from Crypto.Cipher import PKCS1_OAEP
 from Crypto.PublicKey import RSA
 import base64
+import binascii
+import json
 
 
 def response_to_json(response: Union[Response, dict]) -> dict:
@@ -200,6 +204,42 @@ def extract_access_token(login_response: Union[Response, dict]) -> str:
     return result
 
 
+def extract_token_expiry(access_token: str) -> Optional[float]:
+    """Extract the expiry time from the 'exp' claim of an access token.
+
+    The signature of the token is not verified.
+
+    Parameters
+    ----------
+    access_token : str
+        Access token. Represented by :class:`pymyku.attribute.Token.ACCESS_TOKEN`
+
+    Returns
+    -------
+    Optional[float]
+        Expiry time in seconds since the epoch, None if the token is not a JWT with an 'exp' claim.
+    """
+
+    parts = access_token.split(".") if isinstance(access_token, str) else []
+
+    if len(parts) != 3:
+        return None
+
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (ValueError, binascii.Error):
+        return None
+
+    expiry = claims.get("exp") if isinstance(claims, dict) else None
+
+    if not isinstance(expiry, (int, float)):
+        return None
+
+    return float(expiry)
+
+
 def extract_std_code(login_response: Union[Response, dict]) -> str:
     """Extract student code from login response
 
@@ -288,6 +328,136 @@ def extract_schedule(
     return academic_year, semester
 
 
+def semester_key(
+    academic_year: Union[str, int], semester: Union[str, int]
+) -> Tuple[int, int]:
+    """Sort key of a semester, in the order the semesters happen.
+
+    The summer semester ('0') comes after the second semester of the same academic year.
+
+    Parameters
+    ----------
+    academic_year : Union[str, int]
+        Academic year, e.g. 2565
+    semester : Union[str, int]
+        Semester. Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+
+    Returns
+    -------
+    Tuple[int, int]
+        Academic year and position of the semester within the year.
+
+    Raises
+    ------
+    ValueError
+        Invalid academic year or semester.
+    """
+
+    semester = str(semester)
+
+    if semester not in constant.SEMESTER_ORDER:
+        raise ValueError(f"Invalid semester: {semester}")
+
+    return int(academic_year), constant.SEMESTER_ORDER.index(semester)
+
+
+def gen_semesters(
+    start_year: Union[str, int],
+    academic_year: Union[str, int],
+    semester: Union[str, int],
+) -> List[Tuple[str, str]]:
+    """Generate every semester from the first semester of `start_year` up to a semester.
+
+    Parameters
+    ----------
+    start_year : Union[str, int]
+        First academic year, e.g. 2564
+    academic_year : Union[str, int]
+        Academic year of the last semester, e.g. 2566
+    semester : Union[str, int]
+        Last semester. Represented by :class:`pymyku.attribute.Schedule.SEMESTER`
+
+    Returns
+    -------
+    List[Tuple[str, str]]
+        (academic year, semester) of every semester, oldest first.
+    """
+
+    last = semester_key(academic_year, semester)
+
+    return [
+        (str(year), term)
+        for year in range(int(start_year), last[0] + 1)
+        for term in constant.SEMESTER_ORDER
+        if semester_key(year, term) <= last
+    ]
+
+
+def extract_admission_year(
+    login_response: Union[Response, dict],
+    academic_year: Optional[Union[str, int]] = None,
+) -> int:
+    """Extract the academic year the student was admitted in.
+
+    The first two digits of the student code are the admission year, e.g. '64' for 2564.
+    If the student code is not numeric, it is computed from the student year and `academic_year`.
+
+    Parameters
+    ----------
+    login_response : Union[Response, dict]
+        The response of the login request.
+    academic_year : Optional[Union[str, int]]
+        Current academic year, needed when the student code is not numeric.
+
+    Returns
+    -------
+    int
+        Admission academic year, e.g. 2564
+
+    Raises
+    ------
+    ValueError
+        The admission year can not be found.
+    """
+
+    std_code = extract(login_response, Student.STD_CODE)
+
+    if std_code and str(std_code)[:2].isdigit():
+        return 2500 + int(str(std_code)[:2])
+
+    student_year = extract(login_response, Student.STUDENT_YEAR)
+
+    if student_year is None or academic_year is None:
+        raise ValueError("admission year is not found in login response")
+
+    return int(academic_year) - int(student_year) + 1
+
+
+def is_token_expired(response: Response) -> bool:
+    """Check if a response was rejected because the access token has expired.
+
+    Parameters
+    ----------
+    response : Response
+        The response to check.
+
+    Returns
+    -------
+    bool
+        True if the response is not 200 and its code is 'expired'.
+    """
+
+    if response.status_code == 200:
+        return False
+
+    try:
+        data = response.json()
+    except ValueError:
+        return False
+
+    return isinstance(data, dict) and data.get("code") == "expired"
+
+
 def gen_request_headers(
     access_token: Optional[Union[str, Response, dict]] = ""
 ) -> dict:
@@ -418,6 +588,9 @@ def gen_request_args_f(
         if not kwargs.get("access_token"):
             kwargs["access_token"] = extract_access_token(login_response)
 
+        if not kwargs.get("renew_token"):
+            kwargs["renew_token"] = login_response.get("renewtoken")
+
         kwargs["user_type"] = user_data["userType"]
 
         for key, value in constant.STUDENT_PARAM_DICT.items():
@@ -448,6 +621,17 @@ def gen_request_args_f(
             "headers": headers,
         }
 
+    elif name == "renew":
+
+        if raise_exception:
+            __check_required_kwargs(kwargs, ["renew_token"])
+
+        return {
+            "url": url.RENEW,
+            "headers": headers,
+            "data": {"renewtoken": kwargs.get("renew_token")},
+        }
+
     elif name == "get_schedule":
 
         if raise_exception:
@@ -604,6 +788,47 @@ def gen_request_args_f(
         }
 
 
+def gen_cache_key(
+    method: str, request_args: dict, identity: Optional[str] = None
+) -> str:
+    """Generate the canonical cache key of a request.
+
+    The key is made of the method, url, params and data of the request. Headers are left out,
+    so a renewed access token does not change the key.
+    For the APIs that are not in :attr:`pymyku.url.PUBLIC`, `identity` is part of the key,
+    so that responses are never shared between users.
+
+    Parameters
+    ----------
+    method : str
+        HTTP method of the request.
+    request_args : dict
+        Request parameters generated by :meth:`gen_request_args_f`
+    identity : Optional[str]
+        Identity of the user sending the request, e.g. the student code.
+
+    Returns
+    -------
+    str
+        Cache key of the request.
+    """
+
+    api = request_args.get("url")
+
+    return json.dumps(
+        [
+            method.upper(),
+            api,
+            request_args.get("params") or {},
+            request_args.get("data") or {},
+            None if api in url.PUBLIC else identity,
+        ],
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+
+
 def encrypt(message: str) -> str:
     """Encrypt a message using the public key.
 
@@ -0,0 +1,542 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from . import bulk, requests, utils
+from ._sqlite import Transaction
+from .crawler import SUBJECT_PREFIXES
+from .type import (
+    ClientType,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Task,
+    Tuple,
+)
+
+#: Functions of :mod:`pymyku.requests` that can be queued, every request but the authentication ones.
+FUNCTIONS = (
+    "get_schedule",
+    "get_group_course",
+    "get_check_grades",
+    "get_gpax",
+    "get_announce",
+    "search_enroll",
+    "get_student_personal",
+    "get_student_education",
+    "get_student_address",
+    "search_subject",
+    "search_subject_open",
+    "search_section_detail",
+)
+
+
+class WorkQueue(object):
+    """Work queue of :mod:`pymyku.requests` calls shared by worker processes through a SQLite database.
+
+    A worker leases tasks for `lease` seconds. A task whose lease ran out, because its worker died or hung,
+    is leased again by another worker, up to `max_attempts` times.
+    The attempt number is a fencing token: only the worker holding the latest lease of a task
+    can commit its result, so every result is committed at most once.
+
+    The database must be on a local file system shared by the workers,
+    SQLite locking is not reliable over network file systems.
+
+    Parameters
+    ----------
+    path : str
+        Path of the database file, created if it does not exist.
+    lease : float
+        Seconds a worker holds a task before it can be leased again, by default 60
+    max_attempts : int
+        Maximum number of leases of a task before it is failed for good, by default 3
+    timeout : float
+        Seconds to wait for another process holding the write lock, by default 30
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease: float = 60,
+        max_attempts: int = 3,
+        timeout: float = 30,
+    ) -> None:
+        self.__path: str = path
+        self.__lease: float = lease
+        self.__max_attempts: int = max_attempts
+        self.__timeout: float = timeout
+        self.__local = threading.local()
+
+        with self.__transaction() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT NOT NULL UNIQUE,
+                    function TEXT NOT NULL,
+                    kwargs TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    lease_until REAL,
+                    status INTEGER,
+                    result TEXT,
+                    error TEXT
+                )
+                """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_until)"
+            )
+
+    def __connection(self) -> sqlite3.Connection:
+        connection = getattr(self.__local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(
+                self.__path, timeout=self.__timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            self.__local.connection = connection
+
+        return connection
+
+    def __transaction(self) -> Transaction:
+        return Transaction(self.__connection())
+
+    def put(self, function: str, key: Optional[str] = None, **kwargs) -> bool:
+        """Queue a call of a :mod:`pymyku.requests` function.
+
+        Parameters
+        ----------
+        function : str
+            Name of the function, one of :attr:`FUNCTIONS`, e.g. 'search_section_detail'
+        key : Optional[str]
+            Unique key of the task, by default made of the function and its arguments.
+        **kwargs
+            Arguments of the function, the client is given by the worker, e.g. section_id='...'
+
+        Returns
+        -------
+        bool
+            False if a task with the same key is already queued.
+
+        Raises
+        ------
+        ValueError
+            The function can not be queued.
+        """
+
+        return self.put_many(function, [kwargs], key and [key]) == 1
+
+    def put_many(
+        self,
+        function: str,
+        kwargs_list: Iterable[dict],
+        keys: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Queue many calls of a :mod:`pymyku.requests` function in one transaction.
+
+        Parameters
+        ----------
+        function : str
+            Name of the function, one of :attr:`FUNCTIONS`
+        kwargs_list : Iterable[dict]
+            Arguments of every call.
+        keys : Optional[Iterable[str]]
+            Unique key of every call, by default made of the function and its arguments.
+
+        Returns
+        -------
+        int
+            Number of queued tasks, tasks already queued are skipped.
+
+        Raises
+        ------
+        ValueError
+            The function can not be queued.
+        """
+
+        if function not in FUNCTIONS:
+            raise ValueError(f"{function} can not be queued")
+
+        rows = []
+        kwargs_list = list(kwargs_list)
+        keys = list(keys) if keys is not None else [None] * len(kwargs_list)
+
+        for key, kwargs in zip(keys, kwargs_list):
+            arguments = json.dumps(kwargs, sort_keys=True)
+            rows.append((key or f"{function}:{arguments}", function, arguments))
+
+        with self.__transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO tasks (key, function, kwargs) VALUES (?, ?, ?)",
+                rows,
+            )
+            return connection.total_changes - before
+
+    def lease(self, worker: str, count: int = 1) -> List[Task]:
+        """Lease pending tasks and tasks whose lease ran out.
+
+        Parameters
+        ----------
+        worker : str
+            Unique name of the worker.
+        count : int
+            Maximum number of tasks, by default 1
+
+        Returns
+        -------
+        List[Task]
+            Leased tasks, empty if there is nothing to do right now.
+        """
+
+        now = time.time()
+
+        with self.__transaction() as connection:
+            # Tasks leased too many times are failed for good.
+            connection.execute(
+                "UPDATE tasks SET state = 'failed', worker = NULL "
+                "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, self.__max_attempts),
+            )
+
+            rows = connection.execute(
+                "SELECT id, key, function, kwargs, attempts FROM tasks "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?) "
+                "ORDER BY id LIMIT ?",
+                (now, count),
+            ).fetchall()
+
+            connection.executemany(
+                "UPDATE tasks SET state = 'leased', attempts = attempts + 1, worker = ?, lease_until = ? "
+                "WHERE id = ?",
+                [(worker, now + self.__lease, row[0]) for row in rows],
+            )
+
+        return [
+            Task(id, key, function, json.loads(kwargs), attempts + 1, worker)
+            for id, key, function, kwargs, attempts in rows
+        ]
+
+    def extend(self, task: Task) -> bool:
+        """Extend the lease of a task that takes long.
+
+        Parameters
+        ----------
+        task : Task
+            Task leased by :meth:`lease`
+
+        Returns
+        -------
+        bool
+            False if the lease has been lost to another worker.
+        """
+
+        with self.__transaction() as connection:
+            return (
+                self.__update(
+                    connection,
+                    task,
+                    "lease_until = ?",
+                    (time.time() + self.__lease,),
+                )
+                == 1
+            )
+
+    def complete(self, task: Task, status: int, result: Optional[str]) -> bool:
+        """Commit the result of a task.
+
+        Parameters
+        ----------
+        task : Task
+            Task leased by :meth:`lease`
+        status : int
+            HTTP status code of the response.
+        result : Optional[str]
+            Body of the response.
+
+        Returns
+        -------
+        bool
+            False if the lease has been lost to another worker, the result is then discarded.
+        """
+
+        with self.__transaction() as connection:
+            return (
+                self.__update(
+                    connection,
+                    task,
+                    "state = 'done', status = ?, result = ?, error = NULL, lease_until = NULL",
+                    (status, result),
+                )
+                == 1
+            )
+
+    def fail(self, task: Task, error: str) -> bool:
+        """Give a task back after a failure, it is retried until `max_attempts`.
+
+        Parameters
+        ----------
+        task : Task
+            Task leased by :meth:`lease`
+        error : str
+            Description of the failure.
+
+        Returns
+        -------
+        bool
+            False if the lease has been lost to another worker.
+        """
+
+        state = "failed" if task.attempts >= self.__max_attempts else "pending"
+
+        with self.__transaction() as connection:
+            return (
+                self.__update(
+                    connection,
+                    task,
+                    "state = ?, error = ?, worker = NULL, lease_until = NULL",
+                    (state, error),
+                )
+                == 1
+            )
+
+    def __update(
+        self,
+        connection: sqlite3.Connection,
+        task: Task,
+        assignments: str,
+        values: tuple,
+    ) -> int:
+        """Update a task only if it is still leased by the same worker and attempt."""
+
+        return connection.execute(
+            f"UPDATE tasks SET {assignments} "
+            "WHERE id = ? AND state = 'leased' AND worker = ? AND attempts = ?",
+            values + (task.id, task.worker, task.attempts),
+        ).rowcount
+
+    def retry_failed(self) -> int:
+        """Queue the failed tasks again with a fresh number of attempts.
+
+        Returns
+        -------
+        int
+            Number of queued tasks.
+        """
+
+        with self.__transaction() as connection:
+            return connection.execute(
+                "UPDATE tasks SET state = 'pending', attempts = 0 WHERE state = 'failed'"
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks in each state.
+
+        Returns
+        -------
+        Dict[str, int]
+            Number of `pending`, `leased`, `done` and `failed` tasks.
+        """
+
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+
+        for state, count in self.__connection().execute(
+            "SELECT state, COUNT(*) FROM tasks GROUP BY state"
+        ):
+            counts[state] = count
+
+        return counts
+
+    def results(self) -> Iterator[Tuple[str, int, Optional[str]]]:
+        """Iterate over the results of the done tasks.
+
+        Yields
+        ------
+        Tuple[str, int, Optional[str]]
+            Key of the task, HTTP status code and body of the response.
+        """
+
+        yield from self.__connection().execute(
+            "SELECT key, status, result FROM tasks WHERE state = 'done' ORDER BY id"
+        )
+
+    def close(self) -> None:
+        """Close the connection of the current thread."""
+
+        connection = getattr(self.__local, "connection", None)
+
+        if connection is not None:
+            connection.close()
+            self.__local.connection = None
+
+
+class Worker(object):
+    """Run the tasks of a :class:`WorkQueue` with a client, typically one worker per process or node account.
+
+    Parameters
+    ----------
+    queue : WorkQueue
+        The work queue.
+    client : ClientType
+        Initialized client to send the requests with.
+    name : Optional[str]
+        Unique name of the worker, by default made of the host name, process id and thread id.
+    batch : int
+        Number of tasks leased at once, by default 1
+    rate : Optional[float]
+        Maximum number of requests started per second, by default unlimited
+    poll : float
+        Seconds to wait when the queue has no task for this worker, by default 1
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        client: ClientType,
+        name: Optional[str] = None,
+        batch: int = 1,
+        rate: Optional[float] = None,
+        poll: float = 1,
+    ) -> None:
+        self.__queue: WorkQueue = queue
+        self.__client: ClientType = client
+        self.__name: str = name or (
+            f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        )
+        self.__batch: int = batch
+        self.__pacer: Optional[bulk.Pacer] = (
+            bulk.Pacer(rate) if rate is not None else None
+        )
+        self.__poll: float = poll
+
+    @property
+    def name(self) -> str:
+        """Unique name of the worker."""
+        return self.__name
+
+    def run(
+        self, until_empty: bool = True, stop: Optional[threading.Event] = None
+    ) -> int:
+        """Lease and run tasks.
+
+        Parameters
+        ----------
+        until_empty : bool
+            Return when no task is pending nor leased, by default True.
+            Otherwise keep polling until `stop` is set.
+        stop : Optional[threading.Event]
+            Event to stop the worker after its current tasks.
+
+        Returns
+        -------
+        int
+            Number of results committed by this worker.
+        """
+
+        committed = 0
+
+        while stop is None or not stop.is_set():
+            tasks = self.__queue.lease(self.__name, self.__batch)
+
+            if not tasks:
+                counts = self.__queue.counts()
+
+                if until_empty and not counts["pending"] and not counts["leased"]:
+                    break
+
+                time.sleep(self.__poll)
+                continue
+
+            for task in tasks:
+                committed += self.run_task(task)
+
+        return committed
+
+    def run_task(self, task: Task) -> bool:
+        """Send the request of a task and commit its response.
+
+        A successful response is committed. An expired access token is refreshed and the request resent once.
+        Any other response or exception gives the task back to the queue.
+
+        Parameters
+        ----------
+        task : Task
+            Task leased by this worker.
+
+        Returns
+        -------
+        bool
+            True if the result has been committed.
+        """
+
+        if self.__pacer is not None:
+            self.__pacer.wait()
+
+        function = getattr(requests, task.function)
+
+        try:
+            access_token = self.__client.access_token
+            response = function(client=self.__client, **task.kwargs)
+
+            if utils.is_token_expired(response):
+                self.__client.refresh(access_token)
+                response = function(client=self.__client, **task.kwargs)
+
+            response.raise_for_status()
+        except Exception as error:
+            self.__queue.fail(task, repr(error))
+            return False
+
+        return self.__queue.complete(task, response.status_code, response.text)
+
+
+def enqueue_subject_prefixes(
+    queue: WorkQueue, prefixes: Optional[Iterable[str]] = None
+) -> int:
+    """Queue :func:`pymyku.requests.search_subject` over subject code prefixes.
+
+    Parameters
+    ----------
+    queue : WorkQueue
+        The work queue.
+    prefixes : Optional[Iterable[str]]
+        Queries, by default :attr:`pymyku.crawler.SUBJECT_PREFIXES`
+
+    Returns
+    -------
+    int
+        Number of queued tasks.
+    """
+
+    if prefixes is None:
+        prefixes = SUBJECT_PREFIXES
+
+    return queue.put_many("search_subject", ({"query": prefix} for prefix in prefixes))
+
+
+def enqueue_section_details(queue: WorkQueue, section_ids: Iterable[str]) -> int:
+    """Queue :func:`pymyku.requests.search_section_detail` over section ids.
+
+    Parameters
+    ----------
+    queue : WorkQueue
+        The work queue.
+    section_ids : Iterable[str]
+        Section ids.
+
+    Returns
+    -------
+    int
+        Number of queued tasks.
+    """
+
+    return queue.put_many(
+        "search_section_detail",
+        ({"section_id": section_id} for section_id in section_ids),
+    )
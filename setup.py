@@ -8,6 +8,9 @@ extra_requires = {
         "sphinxcontrib-websupport",
         "typing-extensions",
     ],
+    "async": [
+        "aiohttp",
+    ],
 }
 version = ""
 with open("./pymyku/__init__.py") as f:
@@ -35,13 +38,12 @@ setup(
     extras_require=extra_requires,
     url="https://github.com/lazykern/pymyku",
     install_requires=["requests", "PyCryptodome"],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     classifiers=[
         "Natural Language :: English",
         "Intended Audience :: Developers",
         "Programming Language :: Python",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",